@@ -0,0 +1,361 @@
+# =============================================================================
+# Add these methods to your controller/db/db.py OrchestrationDB class
+# =============================================================================
+# controller/routes/workflows.py uses them when present and falls back to the
+# older methods otherwise.
+#
+# All SQL here is literal text with ? parameters: sqlite3 keeps an LRU of
+# compiled statements per connection keyed on the exact SQL string
+# (sqlite3.connect(..., cached_statements=128) by default), so repeated calls
+# skip parsing and planning. Never format values or column names into it.
+
+def add_approval_counted(self, workflow_id: str, approver: str, level: int = 1) -> dict:
+    """
+    Add an approval and return the resulting approval state in one call,
+    so the caller does not have to re-read the workflow.
+    Returns None if the workflow does not exist, otherwise
+    {'added': bool, 'approvals': int, 'required': int, 'status': str,
+     'conflict': bool}. Nothing is added unless the workflow is still
+    'pending'; 'conflict' means approvals changed concurrently (retry).
+    """
+    cursor = self.conn.cursor()
+    cursor.execute(
+        "SELECT approvals_json, required_approval_levels, status FROM workflows WHERE workflow_id = ?",
+        (workflow_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    try:
+        approvals = json.loads(row['approvals_json'] or '[]')
+    except Exception:
+        approvals = []
+    result = {
+        'added': False,
+        'approvals': len(approvals),
+        'required': row['required_approval_levels'],
+        'status': row['status'],
+        'conflict': False,
+    }
+
+    # No longer approvable, or already approved by this user
+    if row['status'] != 'pending' or any(a.get('approver') == approver for a in approvals):
+        return result
+
+    approvals.append({
+        'approver': approver,
+        'level': level,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+    # Only if nobody changed the row since the SELECT above
+    cursor.execute(
+        "UPDATE workflows SET approvals_json = ? "
+        "WHERE workflow_id = ? AND status = 'pending' AND approvals_json IS ?",
+        (json.dumps(approvals), workflow_id, row['approvals_json'])
+    )
+    self.conn.commit()
+    if cursor.rowcount != 1:
+        result['conflict'] = True
+        return result
+
+    result['added'] = True
+    result['approvals'] = len(approvals)
+    return result
+
+
+
+def approve_reexec_atomic(self, request_id: int, workflow_id: str, approver: str) -> dict:
+    """
+    Approve a pending re-execution request and issue its execution token
+    in one transaction. The status='pending' condition on the UPDATE is
+    the claim, so two approvers racing cannot both get a token.
+    Returns None if the request is missing, belongs to another workflow or
+    is no longer pending; otherwise the token row plus 'requester_email'
+    and 'notify_email' for the notification.
+    """
+    cursor = self.conn.cursor()
+    try:
+        cursor.execute('''
+            UPDATE execution_approval_requests
+            SET status = 'approved', approved_by = ?, approved_at = datetime('now')
+            WHERE id = ? AND workflow_id = ? AND status = 'pending'
+        ''', (approver, request_id, workflow_id))
+        if cursor.rowcount != 1:
+            self.conn.rollback()
+            return None
+
+        cursor.execute('''
+            SELECT r.requester_email, w.notify_email, w.ttl_minutes
+            FROM execution_approval_requests r
+            LEFT JOIN workflows w ON w.workflow_id = r.workflow_id
+            WHERE r.id = ?
+        ''', (request_id,))
+        row = cursor.fetchone()
+
+        expires_minutes = int(row['ttl_minutes']) if row['ttl_minutes'] else 15
+        expires_at = (datetime.utcnow() + timedelta(minutes=expires_minutes)).isoformat()
+        token_value = secrets.token_urlsafe(24)
+
+        cursor.execute('''
+            INSERT INTO execution_tokens (workflow_id, token, created_by, created_at, expires_at, used)
+            VALUES (?, ?, ?, datetime('now'), ?, 0)
+        ''', (workflow_id, token_value, approver, expires_at))
+        token_id = cursor.lastrowid
+
+        cursor.execute(
+            "UPDATE execution_approval_requests SET token_id = ? WHERE id = ?",
+            (token_id, request_id)
+        )
+        self.conn.commit()
+    except Exception:
+        self.conn.rollback()
+        raise
+
+    return {
+        'id': token_id,
+        'workflow_id': workflow_id,
+        'token': token_value,
+        'created_by': approver,
+        'expires_at': expires_at,
+        'used': 0,
+        'requester_email': row['requester_email'],
+        'notify_email': row['notify_email'],
+    }
+
+
+def claim_for_execution(self, workflow_id: str) -> dict:
+    """
+    Atomically move an approved workflow to 'executing'.
+    Returns the claimed workflow, or None if it does not exist or is not
+    'approved' (already executing/executed, denied, ...). The caller can
+    re-read the workflow to tell those cases apart.
+    The row is read back before the commit, in the same transaction as the
+    claim (no UPDATE ... RETURNING, which needs SQLite 3.35+).
+    """
+    cursor = self.conn.cursor()
+    try:
+        cursor.execute(
+            "UPDATE workflows SET status = 'executing' WHERE workflow_id = ? AND status = 'approved'",
+            (workflow_id,)
+        )
+        if cursor.rowcount != 1:
+            self.conn.rollback()
+            return None
+        workflow = self.get_workflow(workflow_id)
+        self.conn.commit()
+    except Exception:
+        self.conn.rollback()
+        raise
+
+    return workflow
+
+
+
+def update_status_with_audit(self, workflow_id: str, status: str, action: str, user: str, note: str = "",
+                             *, expected_status: str) -> bool:
+    """
+    Move a workflow from expected_status to status and add its audit entry
+    in one transaction (one commit instead of two, and never one without
+    the other). Returns False, writing nothing, if the workflow is missing
+    or no longer in expected_status.
+    """
+    cursor = self.conn.cursor()
+    try:
+        cursor.execute(
+            "UPDATE workflows SET status = ? WHERE workflow_id = ? AND status = ?",
+            (status, workflow_id, expected_status)
+        )
+        if cursor.rowcount != 1:
+            self.conn.rollback()
+            return False
+        cursor.execute(
+            "INSERT INTO audit_log (workflow_id, action, user, timestamp, note) VALUES (?, ?, ?, ?, ?)",
+            (workflow_id, action, user, datetime.utcnow().isoformat(), note)
+        )
+        self.conn.commit()
+    except Exception:
+        self.conn.rollback()
+        raise
+    return True
+
+
+def decide_workflows_bulk(self, decisions: list, user: str) -> list:
+    """
+    Apply several approve/deny decisions in one transaction.
+    decisions: [{'workflow_id', 'action': 'approve'|'deny', 'level', 'reason'}]
+    Each decision sees the effect of earlier ones in the same batch. Each
+    changed workflow gets one UPDATE guarded like add_approval_counted
+    (still pending, approvals unchanged since the SELECT); a workflow that
+    changed underneath has its decisions reported as 'conflict' and no
+    audit rows. Audit rows go in with one executemany, all in one commit.
+    Returns one result per decision:
+    {'workflow_id', 'action', 'ok', 'status', 'detail', 'conflict',
+     'workflow'} plus 'approvals'/'required' for approvals and 'reason'
+    for denials; 'workflow' is the row (for notifications) or None.
+    """
+    cursor = self.conn.cursor()
+    workflows = {}
+    read_approvals = {}
+    audit_rows = {}
+    results = []
+    now = datetime.utcnow().isoformat()
+    try:
+        for decision in decisions:
+            workflow_id = decision['workflow_id']
+            action = decision['action']
+            if workflow_id not in workflows:
+                cursor.execute("SELECT * FROM workflows WHERE workflow_id = ?", (workflow_id,))
+                row = cursor.fetchone()
+                workflows[workflow_id] = dict(row) if row else None
+                if row:
+                    read_approvals[workflow_id] = row['approvals_json']
+            workflow = workflows[workflow_id]
+            result = {'workflow_id': workflow_id, 'action': action, 'ok': False,
+                      'status': None, 'detail': '', 'conflict': False, 'workflow': workflow}
+            results.append(result)
+            if workflow is None:
+                result['detail'] = "Workflow not found"
+                continue
+            result['status'] = workflow['status']
+            if workflow['status'] != 'pending':
+                result['detail'] = f"Workflow is already {workflow['status']}"
+                continue
+
+            if action == 'deny':
+                reason = decision.get('reason') or "Denied"
+                workflow['status'] = 'denied'
+                audit_rows.setdefault(workflow_id, []).append((workflow_id, 'denied', user, now, reason))
+                result.update(ok=True, status='denied', detail="Workflow denied", reason=reason)
+            else:
+                try:
+                    approvals = json.loads(workflow['approvals_json'] or '[]')
+                except Exception:
+                    approvals = []
+                if any(a.get('approver') == user for a in approvals):
+                    result['detail'] = "Already approved by this user"
+                    continue
+                approvals.append({'approver': user, 'level': decision.get('level', 1), 'timestamp': now})
+                workflow['approvals_json'] = json.dumps(approvals)
+                required = workflow['required_approval_levels']
+                result.update(ok=True, approvals=len(approvals), required=required)
+                if len(approvals) >= required:
+                    workflow['status'] = 'approved'
+                    audit_rows.setdefault(workflow_id, []).append(
+                        (workflow_id, 'fully_approved', user, now, "Workflow fully approved"))
+                    result.update(status='approved', detail="Workflow fully approved")
+                else:
+                    audit_rows.setdefault(workflow_id, []).append(
+                        (workflow_id, 'partial_approval', user, now, f"Approval {len(approvals)}/{required}"))
+                    result['detail'] = "Approval added"
+
+        # Only if nobody changed the row since the SELECT above
+        for workflow_id in list(audit_rows):
+            workflow = workflows[workflow_id]
+            cursor.execute(
+                "UPDATE workflows SET status = ?, approvals_json = ? "
+                "WHERE workflow_id = ? AND status = 'pending' AND approvals_json IS ?",
+                (workflow['status'], workflow['approvals_json'], workflow_id, read_approvals[workflow_id])
+            )
+            if cursor.rowcount != 1:
+                del audit_rows[workflow_id]
+                for result in results:
+                    if result['workflow_id'] == workflow_id and result['ok']:
+                        result.update(ok=False, status=None, conflict=True,
+                                      detail="Workflow changed during the request, retry")
+        if audit_rows:
+            cursor.executemany(
+                "INSERT INTO audit_log (workflow_id, action, user, timestamp, note) VALUES (?, ?, ?, ?, ?)",
+                [row for rows in audit_rows.values() for row in rows]
+            )
+        self.conn.commit()
+    except Exception:
+        self.conn.rollback()
+        raise
+
+    return results
+
+# Keyset pagination for list_workflows_page, one literal statement per
+# filter combination so each one can use its index
+_WORKFLOW_PAGE_SQL = {
+    (False, False): """
+        SELECT * FROM workflows
+        ORDER BY created_at DESC, workflow_id DESC LIMIT ?
+    """,
+    (False, True): """
+        SELECT * FROM workflows
+        WHERE (created_at, workflow_id) < (?, ?)
+        ORDER BY created_at DESC, workflow_id DESC LIMIT ?
+    """,
+    (True, False): """
+        SELECT * FROM workflows WHERE status = ?
+        ORDER BY created_at DESC, workflow_id DESC LIMIT ?
+    """,
+    (True, True): """
+        SELECT * FROM workflows WHERE status = ? AND (created_at, workflow_id) < (?, ?)
+        ORDER BY created_at DESC, workflow_id DESC LIMIT ?
+    """,
+}
+
+
+def list_workflows_page(self, limit: int = 50, cursor: str = None, status: str = None) -> dict:
+    """
+    List workflows newest first, one page at a time.
+    cursor is the 'next_cursor' of the previous page ("created_at|workflow_id").
+    Returns {'workflows': [...], 'next_cursor': str or None}.
+    """
+    params = []
+    if status:
+        params.append(status)
+    if cursor:
+        created_at, _, workflow_id = cursor.rpartition('|')
+        params.extend([created_at, workflow_id])
+    params.append(limit)
+
+    cur = self.conn.cursor()
+    cur.execute(_WORKFLOW_PAGE_SQL[(bool(status), bool(cursor))], params)
+
+    workflows = []
+    for row in cur.fetchall():
+        workflow = dict(row)
+        # Parse JSON fields
+        if workflow.get('targets_json'):
+            try:
+                workflow['targets'] = json.loads(workflow['targets_json'])
+            except Exception:
+                workflow['targets'] = []
+        if workflow.get('approvals_json'):
+            try:
+                workflow['approvals'] = json.loads(workflow['approvals_json'])
+            except Exception:
+                workflow['approvals'] = []
+        workflows.append(workflow)
+
+    next_cursor = None
+    if len(workflows) == limit:
+        last = workflows[-1]
+        next_cursor = f"{last['created_at']}|{last['workflow_id']}"
+    return {'workflows': workflows, 'next_cursor': next_cursor}
+
+# =============================================================================
+# SQL to create workflow indexes (run once)
+# =============================================================================
+
+"""
+-- list_workflows(status=..., limit=...) / list_workflows_page(...) run
+--   SELECT * FROM workflows WHERE status = ? [AND (created_at, workflow_id) < (?, ?)]
+--   ORDER BY created_at DESC[, workflow_id DESC] LIMIT ?
+-- With these indexes sqlite walks the index in order and stops after LIMIT
+-- rows instead of scanning and sorting the whole table. Check with:
+--   EXPLAIN QUERY PLAN SELECT * FROM workflows WHERE status = 'pending'
+--       ORDER BY created_at DESC LIMIT 50;
+-- which should report "SEARCH workflows USING INDEX idx_workflows_status_created".
+
+-- (workflow_id is the keyset tie-breaker; if the older two-column indexes
+-- were already created, DROP INDEX them first.)
+CREATE INDEX IF NOT EXISTS idx_workflows_status_created ON workflows(status, created_at DESC, workflow_id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflows_created ON workflows(created_at DESC, workflow_id DESC);
+
+-- Audit log per workflow (audit endpoint and its COUNT/MAX ETag query)
+CREATE INDEX IF NOT EXISTS idx_audit_log_workflow_ts ON audit_log(workflow_id, timestamp);
+"""
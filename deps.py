@@ -1,10 +1,32 @@
 from fastapi import Request, HTTPException
 from controller.db.db import get_db
 from controller.auth import normalize_identity
+from collections import OrderedDict
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Users resolved from proxy identity headers, cached briefly: the dashboard
+# sends the same credentials on every poll, and each miss costs up to two
+# user lookups. Keyed on a hash of all the credential headers as sent (so a
+# name arriving in a different header is a different entry); least recently
+# used entries are evicted first. Only found users are cached, so new
+# accounts show up at once. User writes call invalidate_user_cache(); the
+# TTL bounds staleness from changes made elsewhere.
+USER_CACHE_TTL = 60.0
+USER_CACHE_MAX = 8192
+_user_cache: OrderedDict = OrderedDict()
+
+_CREDENTIAL_HEADERS = ("X-Auth-User", "X-Client-Cert-CN", "X-Forwarded-User", "X-Remote-User", "Authorization")
+
+
+def _credential_key(request: Request) -> bytes:
+    """Hash of the credential headers of a request"""
+    raw = "\0".join(request.headers.get(h) or "" for h in _CREDENTIAL_HEADERS)
+    return hashlib.blake2b(raw.encode("utf-8", "surrogateescape"), digest_size=16).digest()
+
 
 def _safe_username(value):
     if isinstance(value, str):
@@ -34,6 +56,14 @@ def get_runtime_user_from_request(request: Request):
         or request.headers.get("X-Remote-User")
     )
 
+    key = _credential_key(request)
+    now = time.monotonic()
+    hit = _user_cache.get(key)
+    if hit and hit[0] > now:
+        _user_cache.move_to_end(key)
+        # Callers may adjust the dict (e.g. role upgrades), so hand out a copy
+        return dict(hit[1])
+
     normalized = _safe_username(normalize_identity(hdr_user))
     raw_username = _safe_username(hdr_user)
 
@@ -53,4 +83,17 @@ def get_runtime_user_from_request(request: Request):
         )
         return get_anonymous_user()
 
+    _user_cache[key] = (now + USER_CACHE_TTL, dict(user))
+    _user_cache.move_to_end(key)
+    if len(_user_cache) > USER_CACHE_MAX:
+        _user_cache.popitem(last=False)
     return user
+
+
+def invalidate_user_cache(username: str = None):
+    """Drop cached users: one username, or all (after user/role/status changes)"""
+    if username is None:
+        _user_cache.clear()
+        return
+    for key in [k for k, v in _user_cache.items() if v[1].get("username") == username]:
+        del _user_cache[key]
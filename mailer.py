@@ -8,6 +8,10 @@ import os
 import subprocess
 import logging
 import re
+import smtplib
+import ssl
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, List, Union
@@ -25,6 +29,8 @@ SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "false").lower() == "true"
 SMTP_TIMEOUT = int(os.getenv("SMTP_TIMEOUT", "30"))
 SENDMAIL_PATH = os.getenv("SENDMAIL_PATH", "/usr/sbin/sendmail")
 EMAIL_DRY_RUN = os.getenv("EMAIL_DRY_RUN", "true").lower() == "true"
+# Reused SMTP connection is checked with NOOP after this many idle seconds
+SMTP_IDLE_CHECK = int(os.getenv("SMTP_IDLE_CHECK", "30"))
 
 
 def build_email_html(
@@ -257,6 +263,71 @@ def build_workflow_executed_email(workflow_id, script_id, targets, executed_by,
 # Send Email
 # =============================================================================
 
+# One SMTP connection (TCP + STARTTLS + AUTH) kept open and reused across
+# sends; sends come from worker threads, so it is used under a lock.
+_smtp_conn = None
+_smtp_last_used = 0.0
+_smtp_lock = threading.Lock()
+
+
+def _smtp_connect():
+    ctx = ssl.create_default_context()
+    if SMTP_USE_SSL:
+        srv = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT, context=ctx)
+    else:
+        srv = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_USE_TLS:
+            srv.starttls(context=ctx)
+    if SMTP_USER and SMTP_PASSWORD:
+        srv.login(SMTP_USER, SMTP_PASSWORD)
+    return srv
+
+
+def _smtp_drop():
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.close()
+        except Exception:
+            pass
+        _smtp_conn = None
+
+
+def _smtp_send(sender: str, recipients: List[str], message: str):
+    """Send over the shared connection, reconnecting if the server dropped it"""
+    global _smtp_conn, _smtp_last_used
+    with _smtp_lock:
+        if _smtp_conn is not None and time.monotonic() - _smtp_last_used > SMTP_IDLE_CHECK:
+            try:
+                if _smtp_conn.noop()[0] != 250:
+                    _smtp_drop()
+            except (smtplib.SMTPException, OSError):
+                _smtp_drop()
+        for attempt in (1, 2):
+            if _smtp_conn is None:
+                _smtp_conn = _smtp_connect()
+            try:
+                _smtp_conn.sendmail(sender, recipients, message)
+                _smtp_last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Server closed the idle connection: retry once on a new one
+                _smtp_drop()
+                if attempt == 2:
+                    raise
+
+
+def close_smtp():
+    """Close the shared SMTP connection (app shutdown)"""
+    with _smtp_lock:
+        if _smtp_conn is not None:
+            try:
+                _smtp_conn.quit()
+            except Exception:
+                pass
+        _smtp_drop()
+
+
 def send_email(
     to: Union[str, List[str]],
     subject: str,
@@ -309,18 +380,7 @@ def send_email(
             logger.error(f"sendmail failed: {stderr.decode()}")
             return False
         else:
-            import smtplib, ssl
-            ctx = ssl.create_default_context()
-            if SMTP_USE_SSL:
-                srv = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT, context=ctx)
-            else:
-                srv = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
-                if SMTP_USE_TLS:
-                    srv.starttls(context=ctx)
-            if SMTP_USER and SMTP_PASSWORD:
-                srv.login(SMTP_USER, SMTP_PASSWORD)
-            srv.sendmail(sender, to + cc, msg.as_string())
-            srv.quit()
+            _smtp_send(sender, to + cc, msg.as_string())
             logger.info(f"Email sent via SMTP to {', '.join(to)}")
             return True
     except Exception as e:
@@ -1,6 +1,7 @@
 # main.py - Orchestration System with Client Certificate Authentication
 
 import os
+import asyncio
 import logging
 import secrets
 from fastapi import FastAPI, Request, HTTPException, Depends
@@ -15,6 +16,7 @@ from controller.routes.executions import router as executions_router
 from controller.routes.logs import router as logs_router
 from controller.routes.users import router as users_router
 from controller.routes.reports_api import router as reports_router
+from controller.deps import invalidate_user_cache
 from controller.auth.web_auth import (
     get_current_user_from_session,
     SessionManager,
@@ -75,6 +77,17 @@ def extract_ou_from_dn(dn: str) -> str | None:
     return None
 
 
+@app.middleware("http")
+async def invalidate_cached_users(request: Request, call_next):
+    """Successful user writes (create/update/role/delete) drop the cached runtime users"""
+    response = await call_next(request)
+    if (request.method in ("POST", "PUT", "PATCH", "DELETE")
+            and request.url.path.startswith("/api/users")
+            and response.status_code < 400):
+        invalidate_user_cache()
+    return response
+
+
 @app.middleware("http")
 async def cert_auto_login(request: Request, call_next):
     """Auto-login using certificate CN/OU into DB-backed sessions."""
@@ -344,8 +357,24 @@ async def startup_event():
     logger.info("Orchestration System API Starting")
     logger.info("Authentication: Client Certificate (Smartcard)")
     logger.info("Server: Hypercorn with TLS")
+    # uvloop is much cheaper per await/socket op than the stdlib loop; enable
+    # it with worker_class = "uvloop" in hypercorn.toml (pip install uvloop)
+    loop_type = type(asyncio.get_running_loop())
+    logger.info(f"Event loop: {loop_type.__module__}.{loop_type.__name__}")
     logger.info("=" * 60)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await workflows.close_agent_client()
+    await workflows.close_db_executor()
+    try:
+        from controller.emailer import close_smtp
+    except ImportError:
+        return
+    close_smtp()
+
+
 if __name__ == "__main__":
-    print("Do not run main.py directly; use hypercorn -c hypercorn.toml main:app")
+    print("Do not run main.py directly; use hypercorn -c hypercorn.toml main:app "
+          "(with worker_class = \"uvloop\" in hypercorn.toml)")
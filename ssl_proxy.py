@@ -18,18 +18,23 @@ Usage:
 
 import asyncio
 import base64
+import hashlib
 import logging
 import os
 import re
 import signal
+import socket
 import ssl
 import struct
 import sys
 import time
 import secrets
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 # Certificate parsing with cryptography library
 try:
@@ -43,12 +48,42 @@ except ImportError:
 # YAML support
 try:
     import yaml
+    # libyaml-backed loader when PyYAML was built with it
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
     YAML_AVAILABLE = True
 except ImportError:
     YAML_AVAILABLE = False
     print("ERROR: PyYAML not installed. Install with: pip install pyyaml")
     sys.exit(1)
 
+# Faster event loop (optional): pip install uvloop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Incremental C request parser (optional): pip install httptools
+try:
+    import httptools
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+# NTLM wire layouts (compiled once instead of re-parsing format strings per call)
+# Type 2: signature, type, target name (len, maxlen, offset), flags, challenge, context
+_NTLM_HEADER = struct.Struct('<8sIHHI I 8s 8s')
+# 'NTLMSSP\0' signature as a single integer for one compare
+_NTLMSSP_MAGIC = int.from_bytes(b'NTLMSSP\x00', 'little')
+# Type 3 domain and user security buffers (len, maxlen, offset) starting at byte 28
+_NTLM_T3_OFFSETS = struct.Struct('<HHI HHI')
+
+# Session cookie name as it appears in the raw Cookie header
+_COOKIE_NEEDLE = b'proxy_session='
+
 
 # ============================================================================
 # Configuration Classes
@@ -65,6 +100,7 @@ class BackendConfig:
     websocket: bool = False
     timeout: int = 300
     auth_required: bool = True
+    pool_size: int = 8
 
 
 @dataclass
@@ -102,6 +138,9 @@ class ProxyConfig:
     
     # Advanced
     read_buffer: int = 65536
+    copy_buf_size: int = 262144
+    max_request_body: int = 104857600
+    socket_buffer_bytes: int = 0
 
 
 # ============================================================================
@@ -142,7 +181,7 @@ def load_config(config_path: str) -> ProxyConfig:
         sys.exit(1)
     
     with open(config_path) as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
     
     # Extract sections with defaults
     server = data.get('server', {})
@@ -186,6 +225,9 @@ def load_config(config_path: str) -> ProxyConfig:
         
         # Advanced
         read_buffer=advanced.get('read_buffer', 65536),
+        copy_buf_size=advanced.get('copy_buf_size', 262144),
+        max_request_body=advanced.get('max_request_body', 104857600),
+        socket_buffer_bytes=advanced.get('socket_buffer_bytes', 0),
     )
     
     # Parse backends
@@ -199,6 +241,7 @@ def load_config(config_path: str) -> ProxyConfig:
             websocket=bdata.get('websocket', False),
             timeout=bdata.get('timeout', 300),
             auth_required=bdata.get('auth_required', True),
+            pool_size=bdata.get('pool_size', 8),
         )
     
     return config
@@ -291,20 +334,57 @@ class AuthManager:
     def __init__(self, config: ProxyConfig, logger: logging.Logger):
         self.config = config
         self.logger = logger
-        self.sessions: Dict[str, dict] = {}
+        # Insertion (= creation) ordered so expiry and eviction pop from the front
+        self.sessions: OrderedDict[str, dict] = OrderedDict()
+        self.max_sessions = 50_000
+        # Identity per live TLS connection; entries vanish with the connection
+        self._cert_cache: WeakKeyDictionary = WeakKeyDictionary()
+        # Identity per certificate (SHA-256 of the DER), shared across
+        # connections; least recently used entries are evicted first
+        self._fp_cache: OrderedDict[bytes, Optional[dict]] = OrderedDict()
+        self.max_fp_cache = 4096
     
     def extract_cert_user(self, ssl_obj) -> Optional[dict]:
-        """Extract user from client certificate"""
+        """Extract user from client certificate (parsed once per TLS connection)"""
+        if not ssl_obj:
+            return None
+        try:
+            return self._cert_cache[ssl_obj]
+        except KeyError:
+            pass
+        user = self._parse_cert_user(ssl_obj)
+        self._cert_cache[ssl_obj] = user
+        return user
+    
+    def _parse_cert_user(self, ssl_obj) -> Optional[dict]:
+        """Parse the peer certificate of a TLS connection into a user dict"""
         try:
-            if not ssl_obj:
-                return None
-            
             # Get certificate in DER (binary) format
             cert_der = ssl_obj.getpeercert(binary_form=True)
             if not cert_der:
                 self.logger.debug("No client certificate provided")
                 return None
             
+            fp = hashlib.sha256(cert_der).digest()
+            try:
+                user = self._fp_cache[fp]
+                self._fp_cache.move_to_end(fp)
+                return user
+            except KeyError:
+                pass
+            user = self._identity_from_der(cert_der)
+            self._fp_cache[fp] = user
+            if len(self._fp_cache) > self.max_fp_cache:
+                self._fp_cache.popitem(last=False)
+            return user
+            
+        except Exception as e:
+            self.logger.error(f"Cert extraction error: {e}")
+            return None
+    
+    def _identity_from_der(self, cert_der: bytes) -> Optional[dict]:
+        """Build the user dict from a DER certificate"""
+        try:
             # Parse certificate
             cn, _, cert_dn = extract_cert_identity(cert_der, self.logger)
             
@@ -330,24 +410,22 @@ class AuthManager:
         challenge = secrets.token_bytes(8)
         target = self.config.ntlm_domain.encode('utf-16-le')
         
-        msg = b'NTLMSSP\x00'
-        msg += struct.pack('<I', 2)
-        msg += struct.pack('<HHI', len(target), len(target), 56)
-        msg += struct.pack('<I', 0xe2898235)
-        msg += challenge
-        msg += b'\x00' * 8
-        msg += target
+        msg = _NTLM_HEADER.pack(
+            b'NTLMSSP\x00', 2,
+            len(target), len(target), 56,
+            0xe2898235, challenge, b'\x00' * 8
+        ) + target
         
         return base64.b64encode(msg)
     
-    def verify_ntlm(self, auth_header: str) -> Optional[dict]:
-        """Verify NTLM Type 3 response"""
+    def verify_ntlm(self, auth_header: bytes) -> Optional[dict]:
+        """Verify NTLM Type 3 response (raw Authorization header value)"""
         try:
-            if not auth_header.startswith('NTLM '):
+            if auth_header[:5] != b'NTLM ':
                 return None
             
-            data = base64.b64decode(auth_header[5:])
-            if not data.startswith(b'NTLMSSP\x00'):
+            data = base64.b64decode(memoryview(auth_header)[5:])
+            if len(data) < 12 or int.from_bytes(data[:8], 'little') != _NTLMSSP_MAGIC:
                 return None
             
             msg_type = struct.unpack('<I', data[8:12])[0]
@@ -357,10 +435,8 @@ class AuthManager:
             
             if msg_type == 3:
                 # Extract username from Type 3
-                domain_len = struct.unpack('<H', data[28:30])[0]
-                domain_off = struct.unpack('<I', data[32:36])[0]
-                user_len = struct.unpack('<H', data[36:38])[0]
-                user_off = struct.unpack('<I', data[40:44])[0]
+                (domain_len, _, domain_off,
+                 user_len, _, user_off) = _NTLM_T3_OFFSETS.unpack_from(data, 28)
                 
                 domain = data[domain_off:domain_off+domain_len].decode('utf-16-le')
                 username = data[user_off:user_off+user_len].decode('utf-16-le')
@@ -380,16 +456,32 @@ class AuthManager:
         """Create authenticated session"""
         sid = secrets.token_urlsafe(32)
         self.sessions[sid] = {**user, 'created': time.time()}
+        # Bound memory: drop the oldest session on overflow
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
         return sid
     
     def get_session(self, sid: str) -> Optional[dict]:
         """Get session if valid"""
         session = self.sessions.get(sid)
-        if session and time.time() - session['created'] < self.config.session_timeout:
+        if session is None:
+            return None
+        if time.time() - session['created'] < self.config.session_timeout:
             return session
-        if sid in self.sessions:
-            del self.sessions[sid]
+        del self.sessions[sid]
         return None
+    
+    async def reap_sessions(self, interval: int = 60):
+        """Periodically drop expired sessions.
+        
+        Sessions are kept in creation order, so expired ones are always at
+        the front and each sweep only touches what it removes.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.time() - self.config.session_timeout
+            while self.sessions and next(iter(self.sessions.values()))['created'] < cutoff:
+                self.sessions.popitem(last=False)
 
 
 # ============================================================================
@@ -408,18 +500,61 @@ class Router:
             key=lambda x: len(x[1].path_prefix),
             reverse=True
         )
+        self.compile()
     
-    def route(self, path: str) -> Tuple[Optional[str], Optional[BackendConfig]]:
-        """Find backend for path"""
-        for bid, backend in self.backends:
-            if path.startswith(backend.path_prefix):
-                return bid, backend
+    def compile(self):
+        """Build the prefix trie used for matching (call again if backends change)
         
+        Character trie over the prefixes: node = [children, (bid, backend)].
+        The first configured backend wins among identical prefixes.
+        """
+        self._trie = [{}, None]
+        for bid, backend in self.config.backends.items():
+            node = self._trie
+            for ch in backend.path_prefix:
+                node = node[0].setdefault(ch, [{}, None])
+            if node[1] is None:
+                node[1] = (bid, backend)
+    
+    def _match(self, path: str):
+        """Longest matching prefix -> ((bid, backend) or None, prefix length)"""
+        node = self._trie
+        match, matched_len = node[1], 0
+        for i, ch in enumerate(path):
+            node = node[0].get(ch)
+            if node is None:
+                break
+            if node[1] is not None:
+                match, matched_len = node[1], i + 1
+        return match, matched_len
+    
+    def _default(self) -> Tuple[Optional[str], Optional[BackendConfig]]:
+        """Configured default backend, if any"""
         if self.config.default_backend:
             return (self.config.default_backend,
                    self.config.backends.get(self.config.default_backend))
         return None, None
     
+    def route_and_transform(self, path: str) -> Tuple[Optional[str], Optional[BackendConfig], str]:
+        """Find backend for path and the path to send it, in one walk of the path"""
+        match, matched_len = self._match(path)
+        if match is None:
+            bid, backend = self._default()
+            return bid, backend, (self.transform_path(path, backend) if backend else path)
+        
+        bid, backend = match
+        if not backend.strip_prefix:
+            return bid, backend, path or '/'
+        bpath = path[matched_len:]
+        if bpath[:1] != '/':
+            bpath = '/' + bpath
+        return bid, backend, bpath
+    
+    def route(self, path: str) -> Tuple[Optional[str], Optional[BackendConfig]]:
+        """Find backend for path"""
+        match = self._match(path)[0]
+        return match if match is not None else self._default()
+    
     def transform_path(self, path: str, backend: BackendConfig) -> str:
         """Transform path for backend"""
         if backend.strip_prefix:
@@ -433,46 +568,424 @@ class Router:
 # HTTP Utilities
 # ============================================================================
 
-def parse_request(data: bytes) -> Tuple[str, str, dict, bytes]:
-    """Parse HTTP request -> (method, path, headers, body)"""
+# Hop-by-hop headers dropped when forwarding to a backend
+_HOP_HEADERS = frozenset((
+    b'keep-alive', b'upgrade', b'proxy-authorization', b'authorization', b'connection',
+))
+
+# Pre-encoded "name: " prefixes for headers the proxy sends on every hop.
+# ProxyServer adds the configured auth header names at startup.
+_WELL_KNOWN: Dict[bytes, bytes] = {
+    name: name + b': ' for name in (
+        b'host', b'connection', b'upgrade', b'cookie', b'user-agent',
+        b'content-length', b'content-type',
+        b'x-forwarded-for', b'x-forwarded-proto',
+        b'sec-websocket-key', b'sec-websocket-version',
+    )
+}
+
+
+# Raw header name -> lowercased name, seeded with the common ones in the
+# casings clients send, so parsing rarely has to call .lower(). Names not
+# seen here are cached up to a bound (clients control what they send).
+_LC_CACHE: Dict[bytes, bytes] = {}
+_LC_CACHE_MAX = 512
+
+for _name in (
+    b'host', b'connection', b'keep-alive', b'upgrade', b'cookie', b'user-agent',
+    b'accept', b'accept-encoding', b'accept-language', b'authorization',
+    b'proxy-authorization', b'content-length', b'content-type', b'transfer-encoding',
+    b'cache-control', b'pragma', b'origin', b'referer', b'range',
+    b'if-none-match', b'if-modified-since', b'upgrade-insecure-requests',
+    b'x-requested-with', b'x-forwarded-for', b'x-forwarded-proto',
+    b'sec-fetch-site', b'sec-fetch-mode', b'sec-fetch-dest', b'sec-fetch-user',
+    b'sec-ch-ua', b'sec-ch-ua-mobile', b'sec-ch-ua-platform',
+    b'sec-websocket-key', b'sec-websocket-version',
+    b'sec-websocket-extensions', b'sec-websocket-protocol',
+):
+    _LC_CACHE[_name] = _name
+    _LC_CACHE[_name.title()] = _name
+    _LC_CACHE[_name.upper()] = _name
+for _raw in (b'Sec-WebSocket-Key', b'Sec-WebSocket-Version', b'Sec-WebSocket-Extensions',
+             b'Sec-WebSocket-Protocol', b'DNT', b'TE', b'dnt', b'te'):
+    _LC_CACHE[_raw] = _LC_CACHE.get(_raw.lower(), _raw.lower())
+del _name, _raw
+
+
+def session_cookie(cookie: bytes) -> Optional[str]:
+    """proxy_session value from a raw Cookie header, or None"""
+    idx = cookie.find(_COOKIE_NEEDLE)
+    while idx > 0 and cookie[idx - 1] not in b'; ':
+        # Matched the tail of another cookie's name (e.g. x_proxy_session=)
+        idx = cookie.find(_COOKIE_NEEDLE, idx + 1)
+    if idx < 0:
+        return None
+    start = idx + len(_COOKIE_NEEDLE)
+    end = cookie.find(b';', start)
+    sid = cookie[start:end if end != -1 else None].strip()
+    return sid.decode('latin-1') if sid else None
+
+
+def _header_key(name: bytes) -> bytes:
+    """Lowercased header name, via _LC_CACHE"""
+    key = _LC_CACHE.get(name)
+    if key is None:
+        key = name.strip().lower()
+        if len(_LC_CACHE) < _LC_CACHE_MAX:
+            _LC_CACHE[name] = key
+    return key
+
+
+def parse_request(data: bytes) -> Tuple[str, str, List[Tuple[bytes, bytes]], bytes]:
+    """Parse HTTP request -> (method, path, headers, body)
+
+    Headers are (name, value) byte pairs in request order, with names
+    lowercased and values left raw.
+    """
     try:
         if b'\r\n\r\n' in data:
             head, body = data.split(b'\r\n\r\n', 1)
         else:
             head, body = data, b''
         
-        lines = head.decode('utf-8', errors='replace').split('\r\n')
-        parts = lines[0].split(' ')
+        lines = head.split(b'\r\n')
+        parts = lines[0].decode('utf-8', errors='replace').split(' ')
         method = parts[0]
         path = parts[1] if len(parts) > 1 else '/'
         
-        headers = {}
+        headers = []
         for line in lines[1:]:
-            if ':' in line:
-                k, v = line.split(':', 1)
-                headers[k.strip().lower()] = v.strip()
+            k, sep, v = line.partition(b':')
+            if sep:
+                headers.append((_header_key(k), v.strip()))
         
         return method, path, headers, body
     except:
-        return 'GET', '/', {}, b''
+        return 'GET', '/', [], b''
 
 
-def build_response(status: int, reason: str, headers: dict, body: bytes = b'') -> bytes:
-    """Build HTTP response"""
-    lines = [f"HTTP/1.1 {status} {reason}"]
+class _RequestSink:
+    """httptools callbacks collecting a single request"""
+    __slots__ = ('url', 'headers', 'body', 'framed', 'headers_done', 'done')
+    
+    def __init__(self):
+        self.url = b''
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = bytearray()
+        self.framed = False
+        self.headers_done = False
+        self.done = False
+    
+    def on_url(self, url: bytes):
+        self.url += url
+    
+    def on_header(self, name: bytes, value: bytes):
+        key = _header_key(name)
+        if key == b'transfer-encoding':
+            self.framed = True
+        self.headers.append((key, value))
+    
+    def on_headers_complete(self):
+        self.headers_done = True
+    
+    def on_body(self, body: bytes):
+        self.body += body
+    
+    def on_message_complete(self):
+        self.done = True
+
+
+async def _read_chunked(reader: asyncio.StreamReader, max_body: int) -> bytes:
+    """Read a chunked request body (fallback parser), returning it decoded"""
+    body = bytearray()
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        size = int(line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            # Skip trailers up to the terminating blank line
+            while await reader.readuntil(b'\r\n') != b'\r\n':
+                pass
+            return bytes(body)
+        if len(body) + size > max_body:
+            raise ValueError("request body too large")
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+async def read_request(reader: asyncio.StreamReader, chunk_size: int,
+                       max_body: int) -> Optional[Tuple[str, str, List[Tuple[bytes, bytes]], bytes]]:
+    """Read one complete request -> (method, path, headers, body)
+    
+    Returns None if the client closed before sending anything and raises
+    ValueError on a malformed or oversized request. The request head may
+    be up to chunk_size bytes. A chunked body is returned decoded, with
+    Transfer-Encoding replaced by Content-Length. For upgrade requests
+    the body holds any bytes the client sent after the head.
+    """
+    if HTTPTOOLS_AVAILABLE:
+        sink = _RequestSink()
+        parser = httptools.HttpRequestParser(sink)
+        seen = 0
+        while not sink.done:
+            data = await reader.read(chunk_size)
+            if not data:
+                if not seen:
+                    return None
+                raise ValueError("connection closed mid-request")
+            seen += len(data)
+            try:
+                parser.feed_data(data)
+            except httptools.HttpParserUpgrade as e:
+                sink.body += data[e.args[0]:]
+                break
+            except httptools.HttpParserError as e:
+                raise ValueError(str(e)) from None
+            if not sink.headers_done and seen > chunk_size:
+                raise ValueError("request head too large")
+            if len(sink.body) > max_body:
+                raise ValueError("request body too large")
+        method = parser.get_method().decode('ascii', errors='replace')
+        path = sink.url.decode('utf-8', errors='replace')
+        headers, body, framed = sink.headers, bytes(sink.body), sink.framed
+    else:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise ValueError("connection closed mid-request") from None
+        except asyncio.LimitOverrunError:
+            raise ValueError("request head too large") from None
+        if len(head) > chunk_size:
+            raise ValueError("request head too large")
+        method, path, headers, _ = parse_request(head)
+        chunked = framed = False
+        length = 0
+        for name, value in headers:
+            if name == b'transfer-encoding':
+                framed = True
+                chunked = b'chunked' in value.lower()
+            elif name == b'content-length':
+                length = int(value)
+        try:
+            if chunked:
+                body = await _read_chunked(reader, max_body)
+            elif length > max_body:
+                raise ValueError("request body too large")
+            elif length:
+                body = await reader.readexactly(length)
+            else:
+                body = b''
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            raise ValueError("connection closed mid-request") from None
+    
+    # The body is forwarded whole, so re-frame a chunked one by length
+    if framed:
+        headers = [(n, v) for n, v in headers
+                   if n != b'transfer-encoding' and n != b'content-length']
+        headers.append((b'content-length', str(len(body)).encode()))
+    return method, path, headers, body
+
+
+def build_response_parts(status: int, reason: str, headers: dict,
+                         body: bytes = b'') -> List[bytes]:
+    """Build HTTP response as [status line, header lines, blank line, body]
+    
+    For writer.writelines(), so the body is never copied into a joined
+    response.
+    """
     if body:
         headers['Content-Length'] = str(len(body))
-    for k, v in headers.items():
-        lines.append(f"{k}: {v}")
-    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+    head = ''.join([f"{k}: {v}\r\n" for k, v in headers.items()])
+    return [f"HTTP/1.1 {status} {reason}\r\n".encode(), head.encode(), b'\r\n', body]
 
 
-def build_request(method: str, path: str, headers: dict, body: bytes = b'') -> bytes:
-    """Build HTTP request"""
-    lines = [f"{method} {path} HTTP/1.1"]
-    for k, v in headers.items():
-        lines.append(f"{k}: {v}")
-    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+def build_response(status: int, reason: str, headers: dict, body: bytes = b'') -> bytes:
+    """Build HTTP response"""
+    return b''.join(build_response_parts(status, reason, headers, body))
+
+
+# Canned responses for the fixed error paths
+RESP_400_BAD_REQUEST = build_response(400, 'Bad Request', {}, b'Bad request')
+RESP_401_NTLM_REQUEST = build_response(401, 'Unauthorized', {
+    'WWW-Authenticate': 'NTLM',
+    'Connection': 'keep-alive'
+})
+RESP_401_AUTH_REQUIRED = build_response(401, 'Unauthorized', {}, b'Auth required')
+RESP_404_NO_ROUTE = build_response(404, 'Not Found', {}, b'No route')
+RESP_502_BAD_GATEWAY = build_response(502, 'Bad Gateway', {}, b'Backend unavailable')
+
+
+def set_cork(writer: asyncio.StreamWriter, on: bool):
+    """Toggle TCP_CORK on the socket under a stream (no-op where unsupported).
+    
+    While corked the kernel only sends full segments; uncorking flushes
+    whatever is left.
+    """
+    if not hasattr(socket, 'TCP_CORK'):
+        return
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if on else 0)
+        except OSError:
+            pass
+
+
+def encode_headers(headers: List[Tuple[bytes, bytes]]) -> bytes:
+    """Encode (name, value) byte pairs as header lines"""
+    parts = []
+    for name, value in headers:
+        prefix = _WELL_KNOWN.get(name)
+        if prefix is None:
+            prefix = name + b': '
+        parts += (prefix, value, b'\r\n')
+    return b''.join(parts)
+
+
+def set_socket_buffers(sock, size: int):
+    """Set SO_SNDBUF/SO_RCVBUF (0 leaves the OS defaults and autotuning)"""
+    if size > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, size)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+
+
+def tune_socket(stream, bufsize: int = 0):
+    """Set TCP_NODELAY and SO_KEEPALIVE (plus the buffer sizes if given) on
+    the socket under a stream writer or transport.
+    
+    asyncio normally sets TCP_NODELAY already; it is repeated so behaviour
+    does not depend on the loop implementation.
+    """
+    sock = stream.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        set_socket_buffers(sock, bufsize)
+    except OSError:
+        pass
+
+
+def make_listen_socket(host: str, port: int, bufsize: int) -> socket.socket:
+    """Bound, listening socket with its buffer sizes set before listen()
+    
+    Accepted connections inherit the sizes, and setting them before the
+    handshake lets the TCP window scale be chosen to match.
+    """
+    family, _, _, _, addr = socket.getaddrinfo(
+        host or None, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)[0]
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        set_socket_buffers(sock, bufsize)
+        sock.bind(addr)
+        sock.listen(100)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def build_request(method: str, path: str, headers: List[Tuple[bytes, bytes]],
+                  body: bytes = b'', static: bytes = b'') -> bytes:
+    """Build HTTP request from (name, value) byte pairs
+    
+    static is an already encoded header block (see encode_headers) sent
+    after headers.
+    """
+    return b''.join((f"{method} {path} HTTP/1.1\r\n".encode(),
+                     encode_headers(headers), static, b'\r\n', body))
+
+
+class ForwardingProtocol(asyncio.BufferedProtocol):
+    """Backend connection that writes whatever it receives straight to a client
+    
+    Incoming data lands in one preallocated buffer (no StreamReader
+    bytearray in between) and is handed to the client writer as it
+    arrives. Reading pauses while the client's write buffer is over the
+    buffer size. The protocol also stands in for the backend writer:
+    write(), drain(), close() and .transport are what _pump needs.
+    """
+    
+    def __init__(self, client: asyncio.StreamWriter, bufsize: int = 262144):
+        loop = asyncio.get_running_loop()
+        self._client = client
+        self._hwm = bufsize
+        self._buf = bytearray(bufsize)
+        self._mv = memoryview(self._buf)
+        self._write_paused: Optional[asyncio.Future] = None
+        self._read_paused = False
+        # Held so the task is not garbage-collected while it waits
+        self._drain_task: Optional[asyncio.Task] = None
+        self.transport: Optional[asyncio.Transport] = None
+        # First bytes from the backend (the upgrade response) and connection end
+        self.first: asyncio.Future = loop.create_future()
+        self.closed: asyncio.Future = loop.create_future()
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def get_buffer(self, sizehint: int):
+        return self._mv
+    
+    def buffer_updated(self, nbytes: int):
+        data = self._mv[:nbytes].tobytes()
+        if not self.first.done():
+            self.first.set_result(data)
+        self._client.write(data)
+        if (not self._read_paused and
+                self._client.transport.get_write_buffer_size() > self._hwm and
+                (self._drain_task is None or self._drain_task.done())):
+            self._read_paused = True
+            self.transport.pause_reading()
+            self._drain_task = asyncio.ensure_future(self._resume_after_drain())
+    
+    async def _resume_after_drain(self):
+        try:
+            await self._client.drain()
+        except Exception:
+            self.transport.close()
+            return
+        self._read_paused = False
+        if not self.transport.is_closing():
+            self.transport.resume_reading()
+    
+    def eof_received(self):
+        return False
+    
+    def connection_lost(self, exc):
+        if self._drain_task is not None and not self._drain_task.done():
+            self._drain_task.cancel()
+        if not self.first.done():
+            self.first.set_result(b'')
+        if not self.closed.done():
+            self.closed.set_result(None)
+        if self._write_paused is not None and not self._write_paused.done():
+            self._write_paused.set_result(None)
+    
+    def pause_writing(self):
+        self._write_paused = asyncio.get_running_loop().create_future()
+    
+    def resume_writing(self):
+        if self._write_paused is not None and not self._write_paused.done():
+            self._write_paused.set_result(None)
+        self._write_paused = None
+    
+    def write(self, data: bytes):
+        self.transport.write(data)
+    
+    async def drain(self):
+        if self._write_paused is not None:
+            await self._write_paused
+        if self.transport.is_closing():
+            raise ConnectionResetError('Connection lost')
+    
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
 
 
 # ============================================================================
@@ -487,194 +1000,208 @@ class ProxyServer:
         self.logger = setup_logging(config)
         self.auth = AuthManager(config, self.logger)
         self.router = Router(config, self.logger)
+        self._ssl_ctx: Optional[ssl.SSLContext] = None
+        # Log level is fixed at startup, so check it once instead of
+        # formatting debug messages that would be dropped
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        
+        # Configured auth header names, encoded once
+        self._hdr_cert_cn = config.header_cert_cn.encode()
+        self._hdr_cert_dn = config.header_cert_dn.encode()
+        self._hdr_auth_method = config.header_auth_method.encode()
+        for name in (self._hdr_cert_cn, self._hdr_cert_dn, self._hdr_auth_method):
+            _WELL_KNOWN.setdefault(name, name + b': ')
+        
+        # Client headers never forwarded as-is: hop-by-hop ones plus anything
+        # the proxy sets itself (so clients cannot spoof the auth headers)
+        self._strip_headers = _HOP_HEADERS | {
+            b'host', b'x-forwarded-for', b'x-forwarded-proto',
+            self._hdr_cert_cn.lower(), self._hdr_cert_dn.lower(),
+            self._hdr_auth_method.lower(),
+        }
+        self._host_headers = {
+            bid: f"{b.host}:{b.port}".encode() for bid, b in config.backends.items()
+        }
+        # Header block that only depends on the backend and the user,
+        # encoded once per combination
+        self._static_headers = lru_cache(maxsize=1024)(self._build_static_headers)
+        # Idle keep-alive connections per backend (backends with pool_size 0
+        # get no pool and a fresh connection per request)
+        self._pools: Dict[str, asyncio.Queue] = {
+            bid: asyncio.Queue(maxsize=b.pool_size)
+            for bid, b in config.backends.items() if b.pool_size > 0
+        }
     
     async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle client connection"""
         addr = writer.get_extra_info('peername')
         ssl_obj = writer.get_extra_info('ssl_object')
+        debug = self._debug
+        tune_socket(writer)
         
-        self.logger.debug(f"[1] New connection from {addr}")
+        if debug:
+            self.logger.debug(f"[1] New connection from {addr}")
         
         try:
-            data = await asyncio.wait_for(
-                reader.read(self.config.read_buffer),
-                timeout=30
-            )
-            if not data:
-                self.logger.debug(f"[2] No data received, closing")
+            try:
+                request = await asyncio.wait_for(
+                    read_request(reader, self.config.read_buffer,
+                                 self.config.max_request_body),
+                    timeout=30
+                )
+            except ValueError as e:
+                self.logger.warning(f"[3] Bad request from {addr}: {e}")
+                writer.write(RESP_400_BAD_REQUEST)
+                await writer.drain()
+                return
+            if request is None:
+                if debug:
+                    self.logger.debug("[2] No data received, closing")
                 return
             
-            self.logger.debug(f"[2] Received {len(data)} bytes")
-            
-            method, path, headers, body = parse_request(data)
-            self.logger.debug(f"[3] Parsed: {method} {path}")
+            method, path, headers, body = request
+            if debug:
+                self.logger.debug(f"[3] Parsed: {method} {path} ({len(body)} body bytes)")
             
             # Route to backend
-            bid, backend = self.router.route(path)
+            bid, backend, bpath = self.router.route_and_transform(path)
             if not backend:
                 self.logger.warning(f"[4] No route for {path}")
-                writer.write(build_response(404, 'Not Found', {}, b'No route'))
+                writer.write(RESP_404_NO_ROUTE)
                 await writer.drain()
                 return
             
-            self.logger.debug(f"[4] Routed to backend: {bid} ({backend.host}:{backend.port})")
+            if debug:
+                self.logger.debug(f"[4] Routed to backend: {bid} ({backend.host}:{backend.port})")
+            
+            # Single pass over the headers: pick out the values auth and
+            # upgrade handling need, and collect everything that is forwarded
+            # as-is (hop-by-hop and proxy-owned names are left out)
+            cookie = auth = upgrade = connection = b''
+            bheaders = []
+            strip = self._strip_headers
+            for name, value in headers:
+                if name in strip:
+                    if name == b'authorization':
+                        auth = value
+                    elif name == b'upgrade':
+                        upgrade = value
+                    elif name == b'connection':
+                        connection = value
+                    continue
+                if name == b'cookie':
+                    cookie = value
+                bheaders.append((name, value))
             
             # Authentication
             user = None
             if backend.auth_required:
                 # Try cert first
-                self.logger.debug(f"[5] Attempting cert auth...")
                 user = self.auth.extract_cert_user(ssl_obj)
                 
                 # Try NTLM fallback
                 if not user and self.config.ntlm_enabled:
                     # Check session cookie
-                    cookies = headers.get('cookie', '')
-                    for c in cookies.split(';'):
-                        if 'proxy_session=' in c:
-                            sid = c.split('=')[1].strip()
-                            user = self.auth.get_session(sid)
-                            break
+                    sid = session_cookie(cookie) if cookie else None
+                    if sid:
+                        user = self.auth.get_session(sid)
                     
                     if not user:
-                        auth = headers.get('authorization', '')
-                        if auth.startswith('NTLM '):
+                        if auth[:5] == b'NTLM ':
                             user = self.auth.verify_ntlm(auth)
                             if not user:
                                 # Send challenge
                                 challenge = self.auth.create_ntlm_challenge()
-                                resp = build_response(401, 'Unauthorized', {
+                                writer.writelines(build_response_parts(401, 'Unauthorized', {
                                     'WWW-Authenticate': f'NTLM {challenge.decode()}',
                                     'Connection': 'keep-alive'
-                                })
-                                writer.write(resp)
+                                }))
                                 await writer.drain()
                                 return
                         else:
                             # Request NTLM
-                            resp = build_response(401, 'Unauthorized', {
-                                'WWW-Authenticate': 'NTLM',
-                                'Connection': 'keep-alive'
-                            })
-                            writer.write(resp)
+                            writer.write(RESP_401_NTLM_REQUEST)
                             await writer.drain()
                             return
                 
                 if not user:
                     self.logger.warning(f"[6] Auth failed - no user")
-                    writer.write(build_response(401, 'Unauthorized', {}, b'Auth required'))
+                    writer.write(RESP_401_AUTH_REQUIRED)
                     await writer.drain()
                     return
             
-            self.logger.debug(f"[6] Auth success: {user.get('cn', 'unknown')}")
+            if debug:
+                self.logger.debug(f"[6] Auth success: {user.get('cn', 'unknown')}" if user
+                                  else "[6] Auth not required")
+            
+            is_ws = backend.websocket and bool(upgrade) and (
+                upgrade == b'websocket' or b'websocket' in upgrade.lower())
+            
+            # Append the per-request headers this proxy controls; the rest
+            # (host, connection, auth headers, ...) come from the cached block
+            if is_ws:
+                # Keep the client's upgrade handshake for WebSocket
+                bheaders.append((b'upgrade', upgrade))
+                bheaders.append((b'connection', connection))
+            bheaders.append((b'x-forwarded-for', addr[0].encode() if addr else b''))
             
-            # Connect to backend
-            self.logger.debug(f"[7] Connecting to backend {backend.host}:{backend.port}...")
+            if user:
+                static = self._static_headers(bid, is_ws, user.get('cn', ''),
+                                              user.get('auth_method', ''),
+                                              user.get('cert_dn') or '')
+            else:
+                static = self._static_headers(bid, is_ws, None, None, None)
+            req = build_request(method, bpath, bheaders, body, static)
+            if debug:
+                # Log the actual request (first 500 bytes)
+                req_preview = req[:500].decode('utf-8', errors='replace')
+                self.logger.debug(f"[8] Sending {len(req)} bytes to backend:\n{req_preview}")
+            
+            # Send to backend: WebSocket gets its own connection, plain HTTP
+            # goes over a pooled one and gets the response head back
             try:
-                br, bw = await asyncio.wait_for(
-                    asyncio.open_connection(backend.host, backend.port),
-                    timeout=10
-                )
-                self.logger.debug(f"[7] Backend connected successfully")
+                if is_ws:
+                    tunnel = await self._open_tunnel(backend, writer)
+                    tunnel.write(req)
+                else:
+                    br, bw, head = await self._roundtrip(bid, backend, req)
             except Exception as e:
-                self.logger.error(f"[7] Backend connection FAILED: {e}")
-                writer.write(build_response(502, 'Bad Gateway', {}, b'Backend unavailable'))
+                self.logger.error(f"[7] Backend request FAILED: {type(e).__name__}: {e}")
+                writer.write(RESP_502_BAD_GATEWAY)
                 await writer.drain()
                 return
             
-            try:
-                # Transform path
-                bpath = self.router.transform_path(path, backend)
-                
-                # Build backend request headers
-                bheaders = dict(headers)
-                bheaders['host'] = f"{backend.host}:{backend.port}"
-                
-                # Add auth headers using configured header names
-                if user:
-                    bheaders[self.config.header_cert_cn] = user.get('cn', '')
-                    bheaders[self.config.header_auth_method] = user.get('auth_method', '')
-                    if user.get('cert_dn'):
-                        bheaders[self.config.header_cert_dn] = user.get('cert_dn', '')
-                    # Add forwarding headers
-                    bheaders['X-Forwarded-For'] = addr[0] if addr else ''
-                    bheaders['X-Forwarded-Proto'] = 'https'
-                
-                # Check WebSocket first
-                is_ws = (backend.websocket and
-                        'websocket' in headers.get('upgrade', '').lower())
-                
-                # Remove hop headers (but keep connection for HTTP/1.1)
-                for h in ['keep-alive', 'upgrade', 'proxy-authorization', 'authorization']:
-                    bheaders.pop(h, None)
-                
-                # Ensure connection header for HTTP/1.1
-                if not is_ws:
-                    bheaders['connection'] = 'close'
-                
-                if is_ws:
-                    # Keep upgrade headers for WebSocket
-                    bheaders['upgrade'] = headers.get('upgrade', '')
-                    bheaders['connection'] = headers.get('connection', '')
-                    if 'sec-websocket-key' in headers:
-                        bheaders['sec-websocket-key'] = headers['sec-websocket-key']
-                    if 'sec-websocket-version' in headers:
-                        bheaders['sec-websocket-version'] = headers['sec-websocket-version']
-                
-                # Send to backend
-                req = build_request(method, bpath, bheaders, body)
-                self.logger.debug(f"[8] Sending request to backend: {method} {bpath}")
-                self.logger.debug(f"[8] Headers: {list(bheaders.keys())}")
-                
-                # Log the actual request (first 500 bytes)
-                req_preview = req[:500].decode('utf-8', errors='replace')
-                self.logger.debug(f"[8] Request:\n{req_preview}")
-                
-                bw.write(req)
-                await bw.drain()
-                self.logger.debug(f"[8] Request sent ({len(req)} bytes), waiting for response...")
-                
-                if is_ws:
-                    # Forward WebSocket upgrade response
-                    resp = await br.read(4096)
-                    writer.write(resp)
-                    await writer.drain()
+            if is_ws:
+                try:
+                    # The tunnel forwards the upgrade response as it arrives
+                    resp = await asyncio.wait_for(tunnel.first, backend.timeout)
                     
-                    if b'101' in resp[:50]:
+                    # Status code sits at a fixed offset in "HTTP/1.x 101 ..."
+                    if resp.startswith(b'HTTP/1.') and resp[9:12] == b'101':
                         # Proxy WebSocket bidirectionally
-                        await self._proxy_ws(reader, writer, br, bw)
-                else:
-                    # Forward HTTP response
-                    first_chunk = True
-                    total_bytes = 0
-                    self.logger.debug(f"[9] Reading response from backend...")
-                    while True:
-                        try:
-                            chunk = await asyncio.wait_for(
-                                br.read(self.config.read_buffer),
-                                timeout=backend.timeout
-                            )
-                        except Exception as read_err:
-                            self.logger.error(f"[9] Read error: {read_err}")
-                            break
-                            
-                        if not chunk:
-                            self.logger.debug(f"[9] Backend closed connection (EOF)")
-                            break
-                        if first_chunk:
-                            # Log first line of response
-                            first_line = chunk.split(b'\r\n')[0].decode('utf-8', errors='replace')
-                            self.logger.debug(f"[9] Response: {first_line}")
-                            self.logger.debug(f"[9] First chunk size: {len(chunk)} bytes")
-                            first_chunk = False
-                        total_bytes += len(chunk)
-                        writer.write(chunk)
-                        await writer.drain()
-                    
-                    self.logger.debug(f"[10] Forwarded {total_bytes} bytes to client")
-                        
-            finally:
-                bw.close()
+                        await self._proxy_ws(reader, writer, tunnel)
+                finally:
+                    tunnel.close()
+            else:
+                reusable = False
+                try:
+                    # Forward HTTP response, corked so the kernel packs full
+                    # segments; WebSocket traffic above is never corked
+                    set_cork(writer, True)
+                    try:
+                        total_bytes, reusable = await self._forward_response(
+                            br, writer, head, method, backend.timeout)
+                        if debug:
+                            self.logger.debug(f"[9] Forwarded {total_bytes} bytes to client")
+                    except Exception as fwd_err:
+                        self.logger.error(f"[9] Forward error: {type(fwd_err).__name__}: {fwd_err}")
+                    finally:
+                        set_cork(writer, False)
+                finally:
+                    if reusable:
+                        self._release(bid, br, bw)
+                    else:
+                        bw.close()
                 
             self.logger.info(f"{addr} {method} {path} -> {bid}")
             
@@ -687,25 +1214,238 @@ class ProxyServer:
         finally:
             writer.close()
     
-    async def _proxy_ws(self, cr, cw, br, bw):
-        """Bidirectional WebSocket proxy"""
-        async def fwd(r, w):
+    def _build_static_headers(self, bid: str, is_ws: bool, cn: Optional[str],
+                              auth_method: Optional[str], cert_dn: Optional[str]) -> bytes:
+        """Encoded headers fixed for a backend and user (cached in _static_headers)"""
+        headers = [(b'host', self._host_headers[bid])]
+        if not is_ws:
+            headers.append((b'connection', b'keep-alive' if bid in self._pools else b'close'))
+        headers.append((b'x-forwarded-proto', b'https'))
+        
+        # Auth headers using configured header names
+        if auth_method is not None:
+            headers.append((self._hdr_cert_cn, cn.encode()))
+            headers.append((self._hdr_auth_method, auth_method.encode()))
+            if cert_dn:
+                headers.append((self._hdr_cert_dn, cert_dn.encode()))
+        return encode_headers(headers)
+    
+    async def _connect(self, backend: BackendConfig):
+        """Open a new backend connection -> (reader, writer)"""
+        br, bw = await asyncio.wait_for(
+            asyncio.open_connection(backend.host, backend.port,
+                                    limit=self.config.copy_buf_size),
+            timeout=10
+        )
+        tune_socket(bw, bufsize=self.config.socket_buffer_bytes)
+        if self._debug:
+            self.logger.debug(f"[7] Backend connected: {backend.host}:{backend.port}")
+        return br, bw
+    
+    async def _open_tunnel(self, backend: BackendConfig,
+                           client: asyncio.StreamWriter) -> ForwardingProtocol:
+        """Open a backend connection whose data goes straight to client"""
+        loop = asyncio.get_running_loop()
+        transport, tunnel = await asyncio.wait_for(
+            loop.create_connection(
+                lambda: ForwardingProtocol(client, self.config.copy_buf_size),
+                backend.host, backend.port),
+            timeout=10
+        )
+        tune_socket(transport, bufsize=self.config.socket_buffer_bytes)
+        if self._debug:
+            self.logger.debug(f"[7] Backend connected: {backend.host}:{backend.port} (tunnel)")
+        return tunnel
+    
+    async def _acquire(self, bid: str, backend: BackendConfig):
+        """Idle pooled connection for a backend, or a new one -> (reader, writer, reused)"""
+        pool = self._pools.get(bid)
+        while pool is not None and not pool.empty():
+            br, bw = pool.get_nowait()
+            if not bw.is_closing() and not br.at_eof():
+                return br, bw, True
+            bw.close()
+        br, bw = await self._connect(backend)
+        return br, bw, False
+    
+    def _release(self, bid: str, br: asyncio.StreamReader, bw: asyncio.StreamWriter):
+        """Return a backend connection to its pool, closing it if the pool is full"""
+        pool = self._pools.get(bid)
+        if pool is None or pool.full() or bw.is_closing():
+            bw.close()
+        else:
+            pool.put_nowait((br, bw))
+    
+    async def _send(self, bw: asyncio.StreamWriter, data: bytes):
+        """Write a request to the backend, corked so head and body share segments"""
+        set_cork(bw, True)
+        bw.write(data)
+        await bw.drain()
+        set_cork(bw, False)
+    
+    async def _roundtrip(self, bid: str, backend: BackendConfig, req: bytes):
+        """Send req and read the response head -> (reader, writer, head)
+        
+        A pooled connection the backend closed while idle shows up as EOF
+        before any response byte; the request is then sent once more on a
+        new connection.
+        """
+        while True:
+            br, bw, reused = await self._acquire(bid, backend)
             try:
-                while True:
-                    data = await r.read(65536)
-                    if not data:
-                        break
-                    w.write(data)
-                    await w.drain()
-            except:
-                pass
+                await self._send(bw, req)
+                head = await asyncio.wait_for(br.readuntil(b'\r\n\r\n'), backend.timeout)
+                return br, bw, head
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                bw.close()
+                if not reused or getattr(e, 'partial', b''):
+                    raise
+            except BaseException:
+                bw.close()
+                raise
+    
+    async def _forward_response(self, br: asyncio.StreamReader, w: asyncio.StreamWriter,
+                                head: bytes, method: str,
+                                timeout: Optional[float]) -> Tuple[int, bool]:
+        """Relay one backend response to the client -> (bytes sent, reusable)
+        
+        The head goes out with Connection: close, since the client
+        connection ends after this response. The body is copied by its own
+        framing (Content-Length, chunked, or until EOF), so the backend
+        connection is left at a message boundary and can be pooled.
+        """
+        status = int(head[9:12])
+        while 100 <= status < 200:
+            # Interim response (e.g. 100 Continue): pass it on, read the real one
+            w.write(head)
+            head = await asyncio.wait_for(br.readuntil(b'\r\n\r\n'), timeout)
+            status = int(head[9:12])
         
-        t1 = asyncio.create_task(fwd(cr, bw))
-        t2 = asyncio.create_task(fwd(br, cw))
+        reusable = head.startswith(b'HTTP/1.1 ')
+        length = None
+        chunked = False
+        lines = head[:-4].split(b'\r\n')
+        out = [lines[0], b'\r\n']
+        for line in lines[1:]:
+            name = _header_key(line.partition(b':')[0])
+            if name == b'connection':
+                if b'close' in line.lower():
+                    reusable = False
+                continue
+            if name == b'keep-alive':
+                continue
+            if name == b'content-length':
+                length = int(line.partition(b':')[2])
+            elif name == b'transfer-encoding':
+                chunked = b'chunked' in line.lower()
+            out += (line, b'\r\n')
+        out.append(b'Connection: close\r\n\r\n')
+        w.writelines(out)
+        total = sum(map(len, out))
         
-        done, pending = await asyncio.wait([t1, t2], return_when=asyncio.FIRST_COMPLETED)
-        for t in pending:
-            t.cancel()
+        if method == 'HEAD' or status in (204, 304):
+            pass
+        elif chunked:
+            total += await self._copy_chunked(br, w, timeout)
+        elif length is not None:
+            total += await self._copy_exact(br, w, length, timeout)
+        else:
+            # Delimited by the backend closing the connection
+            total += await self._pump(br, w, timeout)
+            reusable = False
+        await w.drain()
+        return total, reusable
+    
+    async def _copy_exact(self, r: asyncio.StreamReader, w: asyncio.StreamWriter,
+                          length: int, timeout: Optional[float]) -> int:
+        """Copy exactly length bytes from r to w"""
+        n = self.config.copy_buf_size
+        transport = w.transport
+        left = length
+        while left:
+            data = await asyncio.wait_for(r.read(min(left, n)), timeout)
+            if not data:
+                raise asyncio.IncompleteReadError(b'', left)
+            left -= len(data)
+            w.write(data)
+            if transport.get_write_buffer_size() > n or transport.is_closing():
+                await w.drain()
+        return length
+    
+    async def _copy_chunked(self, r: asyncio.StreamReader, w: asyncio.StreamWriter,
+                            timeout: Optional[float]) -> int:
+        """Copy a chunked body through unchanged, stopping after the last chunk"""
+        total = 0
+        while True:
+            line = await asyncio.wait_for(r.readuntil(b'\r\n'), timeout)
+            w.write(line)
+            total += len(line)
+            size = int(line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                # Trailers, up to the terminating blank line
+                while line != b'\r\n':
+                    line = await asyncio.wait_for(r.readuntil(b'\r\n'), timeout)
+                    w.write(line)
+                    total += len(line)
+                return total
+            total += await self._copy_exact(r, w, size + 2, timeout)
+    
+    async def _pump(self, r: asyncio.StreamReader, w: asyncio.StreamWriter,
+                    timeout: Optional[float] = None) -> int:
+        """Copy bytes from r to w until EOF, returning the byte count.
+        
+        Used for response bodies delimited only by the backend closing the
+        connection (Content-Length and chunked bodies go through
+        _copy_exact / _copy_chunked) and for the client -> backend side of
+        a WebSocket tunnel (backend -> client is ForwardingProtocol's job).
+        Every read already returns all bytes buffered so far (up to
+        the buffer size), so chunks reach the client as they arrive.
+        drain() is only awaited once the transport holds more than one
+        buffer's worth of unsent data (or the peer went away), plus once
+        at EOF, instead of after every chunk.
+        """
+        n = self.config.copy_buf_size
+        transport = w.transport
+        total = 0
+        while True:
+            if timeout:
+                data = await asyncio.wait_for(r.read(n), timeout)
+            else:
+                data = await r.read(n)
+            if not data:
+                await w.drain()
+                return total
+            total += len(data)
+            w.write(data)
+            if transport.get_write_buffer_size() > n or transport.is_closing():
+                await w.drain()
+    
+    async def _proxy_ws(self, cr, cw, tunnel: ForwardingProtocol):
+        """Bidirectional WebSocket proxy
+        
+        Backend -> client is handled by the tunnel itself; this pumps
+        client -> backend until either side closes. The pump is then
+        cancelled and waited for and both sides are closed, also when the
+        handler itself is cancelled (e.g. on shutdown).
+        
+        Kernel splice() between the two sockets is not an option: the
+        client side is always TLS terminated here, so every byte has to be
+        decrypted/encrypted in userland anyway.
+        """
+        async def fwd():
+            try:
+                await self._pump(cr, tunnel)
+            except Exception:
+                pass
+        
+        up = asyncio.create_task(fwd())
+        try:
+            await asyncio.wait((up, tunnel.closed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            up.cancel()
+            tunnel.close()
+            cw.close()
+            await asyncio.shield(asyncio.gather(up, return_exceptions=True))
     
     def _create_ssl_context(self) -> ssl.SSLContext:
         """Create SSL context"""
@@ -737,24 +1477,49 @@ class ProxyServer:
             print(f"✓ Client cert verification: DISABLED (config)")
         
         ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+        
+        # Fast AEAD suites only for TLS 1.2, no compression, fresh (EC)DH keys.
+        # Session tickets and the server-side session cache stay enabled so
+        # returning clients resume instead of doing a full handshake; TLS 1.3
+        # clients get two tickets per handshake.
+        ctx.options |= ssl.OP_NO_COMPRESSION | ssl.OP_SINGLE_ECDH_USE | ssl.OP_SINGLE_DH_USE
+        ctx.set_ciphers('ECDHE+AESGCM:ECDHE+CHACHA20:!aNULL:!MD5')
+        ctx.num_tickets = 2
+        ctx.set_alpn_protocols(['http/1.1'])
         return ctx
     
     async def start(self):
         """Start server"""
-        ctx = self._create_ssl_context()
+        # Build the context once so its session cache survives restarts of the listener
+        if self._ssl_ctx is None:
+            self._ssl_ctx = self._create_ssl_context()
         
-        server = await asyncio.start_server(
-            self.handle,
-            self.config.listen_host,
-            self.config.listen_port,
-            ssl=ctx
-        )
+        if self.config.socket_buffer_bytes > 0:
+            # Pre-sized listener; accepted sockets inherit its buffers
+            server = await asyncio.start_server(
+                self.handle,
+                sock=make_listen_socket(self.config.listen_host, self.config.listen_port,
+                                        self.config.socket_buffer_bytes),
+                ssl=self._ssl_ctx,
+                limit=self.config.copy_buf_size
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle,
+                self.config.listen_host,
+                self.config.listen_port,
+                ssl=self._ssl_ctx,
+                limit=self.config.copy_buf_size
+            )
+        reaper = asyncio.create_task(self.auth.reap_sessions())
         
         print("=" * 60)
         print("Multi-Backend SSL Proxy")
         print("=" * 60)
         print(f"Listening: https://{self.config.listen_host}:{self.config.listen_port}")
         print(f"NTLM fallback: {self.config.ntlm_enabled}")
+        print(f"Event loop: {type(asyncio.get_running_loop()).__module__.split('.')[0]}")
+        print(f"HTTP parser: {'httptools' if HTTPTOOLS_AVAILABLE else 'builtin'}")
         print("-" * 60)
         print("Auth Headers:")
         print(f"  CN Header:     {self.config.header_cert_cn}")
@@ -773,7 +1538,10 @@ class ProxyServer:
             print(f"Logging to: {self.config.log_file}")
         
         async with server:
-            await server.serve_forever()
+            try:
+                await server.serve_forever()
+            finally:
+                reaper.cancel()
 
 
 # ============================================================================
@@ -795,6 +1563,8 @@ All configuration is done via the YAML file.
         """
     )
     parser.add_argument('--config', '-c', required=True, help='YAML config file (required)')
+    parser.add_argument('--no-uvloop', action='store_true',
+                        help='Use the stdlib asyncio loop even if uvloop is installed')
     args = parser.parse_args()
     
     # Load config
@@ -810,6 +1580,9 @@ All configuration is done via the YAML file.
     signal.signal(signal.SIGINT, shutdown)
     signal.signal(signal.SIGTERM, shutdown)
     
+    if UVLOOP_AVAILABLE and not args.no_uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         asyncio.run(proxy.start())
     except FileNotFoundError as e:
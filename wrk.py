@@ -1,15 +1,45 @@
 # controller/routes/workflows.py - SSL-compatible workflow routes
 
-from fastapi import APIRouter, HTTPException, Depends, Body, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Depends, Body, BackgroundTasks, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html import escape
+from string import Template
+import asyncio
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
 import logging
-import uuid
+import ssl
+import time
+import secrets
+import weakref
 import os
 import httpx
 
-from controller.db.db import get_db
+from controller.db.db import OrchestrationDB
 from controller.deps import verify_token, require_admin, require_approver, verify_approver_jwt, require_execution_token
+from controller.routes.scripts import ExecuteScriptRequest, execute_script
+
+# Optional: orjson serializes workflow payloads much faster than json
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_bytes(obj) -> bytes:
+    """Encode obj as JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=str).encode()
 
 # Safe email import - won't crash if emailer module is missing
 try:
@@ -22,14 +52,237 @@ except ImportError:
         return False
 
 logger = logging.getLogger(__name__)
+if not EMAIL_ENABLED:
+    logger.warning("controller.emailer not available - workflow notification emails are disabled")
 
-router = APIRouter(prefix="/workflows", tags=["workflows"])
+# Every handler's returned dict is encoded by orjson when it is installed
+router = APIRouter(
+    prefix="/workflows",
+    tags=["workflows"],
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse,
+)
 
 # SSL Configuration
 SSL_ENABLED = os.getenv("SSL_ENABLED", "true").lower() == "true"
 SSL_VERIFY = os.getenv("SSL_VERIFY", "false").lower() == "true"
 SSL_CA_CERTS = os.getenv("SSL_CA_CERTS", "./certs/certChain.pem")
 
+# Public base URL used in notification emails
+API_HOST = os.getenv("API_HOST", "https://localhost:7585")
+DASHBOARD_URL = f"{API_HOST}/dashboard"
+REEXEC_API_BASE = f"{API_HOST}/api/workflows"
+
+
+def reload_config():
+    """Re-read API_HOST from the environment (tests, config changes)"""
+    global API_HOST, DASHBOARD_URL, REEXEC_API_BASE
+    API_HOST = os.getenv("API_HOST", "https://localhost:7585")
+    DASHBOARD_URL = f"{API_HOST}/dashboard"
+    REEXEC_API_BASE = f"{API_HOST}/api/workflows"
+
+
+# sqlite calls block, so these routes run them on a single dedicated thread
+# and the event loop keeps serving other requests. That thread has its own
+# connection: the get_db() singleton is used by the other routers from the
+# event loop thread, and a commit/rollback from them must not land inside
+# one of our multi-statement transactions. Other connections (and other
+# processes) are covered by the conditional UPDATEs in the DB layer.
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="workflows-db")
+_workflows_db = None
+
+
+def get_workflows_db() -> OrchestrationDB:
+    """This module's DB handle; only ever used on the DB thread (via run_db)"""
+    global _workflows_db
+    if _workflows_db is None:
+        _workflows_db = OrchestrationDB()
+    return _workflows_db
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking DB method on the DB thread and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+async def close_db_executor():
+    """Let queued DB writes finish, stop the DB thread and close its connection (app shutdown)"""
+    global _workflows_db
+    # shutdown(wait=True) blocks until in-flight calls finish: not on the loop
+    await asyncio.get_running_loop().run_in_executor(None, functools.partial(_DB_EXECUTOR.shutdown, wait=True))
+    if _workflows_db is not None:
+        _workflows_db.close()
+        _workflows_db = None
+
+
+# Short-lived cache of workflow rows for the detail/approve/deny/audit
+# endpoints, which the dashboard hits repeatedly for the same workflow.
+# Every write in this module calls invalidate_workflow(), so the TTL only
+# bounds staleness from writes made by other processes.
+WORKFLOW_CACHE_TTL = 2.0
+WORKFLOW_CACHE_MAX = 4096
+_workflow_cache = {}
+
+# Bursts of dashboard list polls within LIST_CACHE_TTL share one query;
+# any workflow write clears it
+LIST_CACHE_TTL = 1.0
+LIST_CACHE_MAX = 256
+_list_cache = {}
+
+
+async def get_workflow_cached(db, workflow_id: str):
+    """db.get_workflow with a WORKFLOW_CACHE_TTL-second per-process cache"""
+    now = time.monotonic()
+    hit = _workflow_cache.get(workflow_id)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+
+    workflow = await run_db(db.get_workflow, workflow_id)
+    if workflow:
+        if len(_workflow_cache) >= WORKFLOW_CACHE_MAX:
+            # Drop expired entries; if that frees nothing, start over
+            for key in [k for k, v in _workflow_cache.items() if v[0] <= now]:
+                del _workflow_cache[key]
+            if len(_workflow_cache) >= WORKFLOW_CACHE_MAX:
+                _workflow_cache.clear()
+        _workflow_cache[workflow_id] = (now + WORKFLOW_CACHE_TTL, dict(workflow))
+    return workflow
+
+
+# Whether db.create_workflow accepts requestor_email/script_params (newer
+# DB schema); checked once on first create instead of via TypeError
+_create_takes_email = None
+
+
+def create_workflow_takes_email(db) -> bool:
+    """True if create_workflow can store requestor_email and script_params"""
+    global _create_takes_email
+    if _create_takes_email is None:
+        try:
+            params = inspect.signature(db.create_workflow).parameters
+        except (TypeError, ValueError):
+            params = {}
+        _create_takes_email = (
+            ("requestor_email" in params and "script_params" in params)
+            or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        )
+    return _create_takes_email
+
+
+def create_workflow_kwargs(db, request, workflow_id: str) -> dict:
+    """Arguments for db.create_workflow matching the DB schema in use"""
+    kwargs = dict(
+        workflow_id=workflow_id,
+        script_id=request.script_id,
+        targets=request.targets,
+        requestor=request.requestor,
+        required_levels=request.required_approval_levels,
+        notify_email=request.notify_email,
+        ttl_minutes=request.ttl_minutes,
+        reason=request.reason,
+    )
+    if create_workflow_takes_email(db):
+        kwargs["requestor_email"] = request.requestor_email
+        kwargs["script_params"] = request.script_params
+    return kwargs
+
+
+# One in-process lock per workflow so concurrent approve/deny/delete/
+# re-exec calls on the same workflow run one at a time instead of racing
+# their read-check-write sequences. Locks disappear once nobody holds or
+# waits on them. Other processes are still covered by the conditional
+# UPDATEs in the DB layer.
+_workflow_locks = weakref.WeakValueDictionary()
+
+
+def workflow_lock(workflow_id: str) -> asyncio.Lock:
+    lock = _workflow_locks.get(workflow_id)
+    if lock is None:
+        lock = _workflow_locks[workflow_id] = asyncio.Lock()
+    return lock
+
+
+def serialized_per_workflow(handler):
+    """Run a route handler under workflow_lock(workflow_id)"""
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        async with workflow_lock(kwargs["workflow_id"]):
+            return await handler(*args, **kwargs)
+    return wrapper
+
+
+def invalidate_workflow(workflow_id: str):
+    """Forget the cached row (and cached lists) after the workflow was modified"""
+    _workflow_cache.pop(workflow_id, None)
+    _list_cache.clear()
+
+
+async def set_status_with_audit(db, workflow_id: str, status: str, action: str, user: str, note: str = "",
+                                *, expected_status: str) -> bool:
+    """
+    Move the workflow from expected_status to status and write its audit
+    entry, in one hop to the DB thread. False (nothing written) if the
+    workflow is no longer in expected_status.
+    """
+    if hasattr(db, "update_status_with_audit"):
+        # Single guarded transaction (db_methods_for_workflows.py)
+        updated = await run_db(db.update_status_with_audit, workflow_id, status, action, user, note,
+                               expected_status=expected_status)
+    else:
+        def write():
+            current = db.get_workflow(workflow_id)
+            if not current or current.get("status") != expected_status:
+                return False
+            db.update_workflow_status(workflow_id, status)
+            db.add_audit(workflow_id=workflow_id, action=action, user=user, note=note)
+            return True
+
+        updated = await run_db(write)
+    invalidate_workflow(workflow_id)
+    return updated
+
+
+# Literal SQL so sqlite3's per-connection statement cache reuses the
+# compiled statement on every poll
+_AUDIT_VERSION_SQL = "SELECT COUNT(*) AS n, MAX(timestamp) AS latest FROM audit_log WHERE workflow_id = ?"
+_AUDIT_SINCE_SQL = "SELECT * FROM audit_log WHERE workflow_id = ? AND timestamp > ? ORDER BY timestamp DESC"
+
+# Full audit logs are streamed in keyset batches (newest first, rowid breaks
+# timestamp ties) so a long log is never held in memory or encoded in one go
+AUDIT_STREAM_BATCH = 500
+_AUDIT_FIRST_BATCH_SQL = (
+    "SELECT rowid AS _rowid, * FROM audit_log WHERE workflow_id = ? "
+    "ORDER BY timestamp DESC, rowid DESC LIMIT ?"
+)
+_AUDIT_NEXT_BATCH_SQL = (
+    "SELECT rowid AS _rowid, * FROM audit_log WHERE workflow_id = ? "
+    "AND (timestamp, rowid) < (?, ?) "
+    "ORDER BY timestamp DESC, rowid DESC LIMIT ?"
+)
+
+
+# Summary projection for list views: no JSON columns to fetch or decode.
+# LIMIT -1 is sqlite for "no limit"; one literal statement per filter combo.
+_SUMMARY_COLUMNS = "workflow_id, status, requestor, script_id, created_at"
+_SUMMARY_SQL = {
+    (False, False): f"SELECT {_SUMMARY_COLUMNS} FROM workflows "
+                    "ORDER BY created_at DESC, workflow_id DESC LIMIT ?",
+    (False, True): f"SELECT {_SUMMARY_COLUMNS} FROM workflows WHERE (created_at, workflow_id) < (?, ?) "
+                   "ORDER BY created_at DESC, workflow_id DESC LIMIT ?",
+    (True, False): f"SELECT {_SUMMARY_COLUMNS} FROM workflows WHERE status = ? "
+                   "ORDER BY created_at DESC, workflow_id DESC LIMIT ?",
+    (True, True): f"SELECT {_SUMMARY_COLUMNS} FROM workflows WHERE status = ? AND (created_at, workflow_id) < (?, ?) "
+                  "ORDER BY created_at DESC, workflow_id DESC LIMIT ?",
+}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names this ETag"""
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    return inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]
+
 
 # =============================================================================
 # Request Models
@@ -67,11 +320,23 @@ class ApprovePayload(BaseModel):
     request_id: int
 
 
+class BulkDecision(BaseModel):
+    workflow_id: str
+    action: Literal["approve", "deny"]
+    level: int = 1
+    reason: Optional[str] = None
+
+
+class BulkDecisionRequest(BaseModel):
+    decisions: List[BulkDecision]
+    approver: Optional[str] = None  # Defaults to the authenticated user
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
-def get_ssl_verify_config():
+def _resolve_ssl_verify_config():
     if not SSL_VERIFY:
         return False
     if SSL_CA_CERTS and os.path.exists(SSL_CA_CERTS):
@@ -79,84 +344,94 @@ def get_ssl_verify_config():
     return False
 
 
-def build_email_html(
-    title: str,
-    title_color: str,
-    accent_color: str,
-    message: str,
-    details: list,
-    button_text: str = None,
-    button_url: str = None,
-    button_color: str = "#0284c7",
-    footer: str = None
-) -> str:
-    """
-    Build styled HTML email - LIGHT THEME that works in Outlook.
-    Uses bgcolor on every cell for maximum compatibility.
-    
-    Args:
-        title: Email header title
-        title_color: Color for title text (hex)
-        accent_color: Color for accent bar and logo (hex)
-        message: Main message paragraph
-        details: List of tuples [(label, value), ...]
-        button_text: Optional CTA button text
-        button_url: Optional CTA button URL
-        button_color: Button background color
-        footer: Optional footer text
-    """
-    from datetime import datetime
-    
-    # Build details rows with alternating backgrounds
-    rows_html = ""
-    for i, (label, value) in enumerate(details):
-        row_bg = "#f8fafc" if i % 2 == 0 else "#ffffff"
-        rows_html += f"""
+# Resolved once at import; reload_ssl_config() re-checks the CA bundle
+_SSL_VERIFY_CONFIG = _resolve_ssl_verify_config()
+
+
+def get_ssl_verify_config():
+    return _SSL_VERIFY_CONFIG
+
+
+# One client for all agent notifications, so connections (and their TLS
+# sessions) to each agent are kept alive and the CA bundle is loaded once.
+# Created on first use; main.py closes it on shutdown.
+_agent_client: Optional[httpx.AsyncClient] = None
+
+
+def get_agent_client() -> httpx.AsyncClient:
+    """Return the shared httpx client used to call agents"""
+    global _agent_client
+    if _agent_client is None or _agent_client.is_closed:
+        verify_ssl = _SSL_VERIFY_CONFIG
+        if verify_ssl:
+            verify_ssl = ssl.create_default_context(cafile=verify_ssl)
+        _agent_client = httpx.AsyncClient(
+            timeout=10.0,
+            verify=verify_ssl,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        )
+    return _agent_client
+
+
+async def close_agent_client():
+    """Close the shared agent client (app shutdown)"""
+    global _agent_client
+    if _agent_client is not None:
+        await _agent_client.aclose()
+        _agent_client = None
+
+
+async def reload_ssl_config():
+    """Re-check the CA bundle and rebuild the agent client with it"""
+    global _SSL_VERIFY_CONFIG
+    _SSL_VERIFY_CONFIG = _resolve_ssl_verify_config()
+    await close_agent_client()
+    return _SSL_VERIFY_CONFIG
+
+
+# Email HTML, parsed once at import. Values are HTML-escaped before
+# substitution so user-supplied text (reason, names, notes) cannot inject markup.
+# This is deliberately stdlib string.Template rather than Jinja2 (not a
+# dependency of the controller): every notification kind shares one layout,
+# and _email_layout caches it per notification kind (title and colours).
+_EMAIL_ROW_TMPL = Template("""
         <tr>
-            <td bgcolor="{row_bg}" style="padding:12px 16px;border-bottom:1px solid #e2e8f0;color:#64748b;font-weight:600;width:160px;font-family:Arial,sans-serif;font-size:14px;">
-                {label}
+            <td bgcolor="$row_bg" style="padding:12px 16px;border-bottom:1px solid #e2e8f0;color:#64748b;font-weight:600;width:160px;font-family:Arial,sans-serif;font-size:14px;">
+                $label
             </td>
-            <td bgcolor="{row_bg}" style="padding:12px 16px;border-bottom:1px solid #e2e8f0;color:#1e293b;font-family:Arial,sans-serif;font-size:14px;">
-                {value}
+            <td bgcolor="$row_bg" style="padding:12px 16px;border-bottom:1px solid #e2e8f0;color:#1e293b;font-family:Arial,sans-serif;font-size:14px;">
+                $value
             </td>
-        </tr>"""
-    
-    # Build button if provided
-    button_html = ""
-    if button_text and button_url:
-        button_html = f"""
+        </tr>""")
+
+_EMAIL_BUTTON_TMPL = Template("""
         <tr>
             <td colspan="2" bgcolor="#ffffff" align="center" style="padding:28px 0 8px 0;">
                 <table cellpadding="0" cellspacing="0" border="0">
                     <tr>
-                        <td bgcolor="{button_color}" style="border-radius:6px;">
-                            <a href="{button_url}" style="display:inline-block;padding:14px 32px;color:#ffffff;text-decoration:none;font-weight:600;font-size:14px;font-family:Arial,sans-serif;">
-                                {button_text}
+                        <td bgcolor="$button_color" style="border-radius:6px;">
+                            <a href="$button_url" style="display:inline-block;padding:14px 32px;color:#ffffff;text-decoration:none;font-weight:600;font-size:14px;font-family:Arial,sans-serif;">
+                                $button_text
                             </a>
                         </td>
                     </tr>
                 </table>
             </td>
-        </tr>"""
-    
-    # Build footer row
-    footer_html = ""
-    if footer:
-        footer_html = f"""
+        </tr>""")
+
+_EMAIL_FOOTER_TMPL = Template("""
         <tr>
             <td colspan="2" bgcolor="#ffffff" style="padding:16px 0 0 0;font-size:13px;color:#64748b;font-family:Arial,sans-serif;">
-                {footer}
+                $footer
             </td>
-        </tr>"""
-
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        </tr>""")
 
-    return f"""<!DOCTYPE html>
+_EMAIL_PAGE_TMPL = Template("""<!DOCTYPE html>
 <html>
 <head>
 <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{title}</title>
+<title>$title</title>
 </head>
 <body bgcolor="#f1f5f9" style="margin:0;padding:0;background-color:#f1f5f9;font-family:Arial,sans-serif;">
 
@@ -168,7 +443,7 @@ def build_email_html(
 
 <!-- Accent Bar -->
 <tr>
-<td bgcolor="{accent_color}" height="4" style="font-size:1px;line-height:1px;">&nbsp;</td>
+<td bgcolor="$accent_color" height="4" style="font-size:1px;line-height:1px;">&nbsp;</td>
 </tr>
 
 <!-- Header -->
@@ -176,11 +451,11 @@ def build_email_html(
 <td bgcolor="#ffffff" style="padding:24px 32px 16px 32px;">
     <table cellpadding="0" cellspacing="0" border="0">
     <tr>
-    <td bgcolor="{accent_color}" width="44" height="44" align="center" valign="middle" style="border-radius:8px;">
+    <td bgcolor="$accent_color" width="44" height="44" align="center" valign="middle" style="border-radius:8px;">
         <span style="color:#ffffff;font-size:16px;font-weight:bold;font-family:Arial,sans-serif;">O</span>
     </td>
     <td bgcolor="#ffffff" style="padding-left:16px;">
-        <div style="font-size:20px;font-weight:700;color:{title_color};font-family:Arial,sans-serif;">{title}</div>
+        <div style="font-size:20px;font-weight:700;color:$title_color;font-family:Arial,sans-serif;">$title</div>
     </td>
     </tr>
     </table>
@@ -190,7 +465,7 @@ def build_email_html(
 <!-- Message -->
 <tr>
 <td bgcolor="#ffffff" style="padding:0 32px 24px 32px;color:#475569;font-size:15px;line-height:1.6;font-family:Arial,sans-serif;">
-    {message}
+    $message
 </td>
 </tr>
 
@@ -198,9 +473,9 @@ def build_email_html(
 <tr>
 <td bgcolor="#ffffff" style="padding:0 32px 24px 32px;">
     <table width="100%" cellpadding="0" cellspacing="0" border="0" style="border:1px solid #e2e8f0;border-radius:6px;">
-        {rows_html}
-        {button_html}
-        {footer_html}
+        $rows_html
+        $button_html
+        $footer_html
     </table>
 </td>
 </tr>
@@ -208,7 +483,7 @@ def build_email_html(
 <!-- Footer -->
 <tr>
 <td bgcolor="#f8fafc" style="padding:16px 32px;border-top:1px solid #e2e8f0;font-size:12px;color:#94a3b8;font-family:Arial,sans-serif;">
-    Orchestration System &bull; {timestamp}
+    Orchestration System &bull; $timestamp
 </td>
 </tr>
 
@@ -218,7 +493,155 @@ def build_email_html(
 </tr>
 </table>
 </body>
-</html>"""
+</html>""")
+
+
+@functools.lru_cache(maxsize=32)
+def _email_layout(title: str, title_color: str, accent_color: str) -> Template:
+    """The page with one notification kind's title and colours filled in.
+    Only fixed per-kind values go in here: nothing per workflow or per send
+    (details, tokens) is ever kept in the cache."""
+    return Template(_EMAIL_PAGE_TMPL.safe_substitute(
+        title=escape(title).replace("$", "$$"),
+        title_color=title_color,
+        accent_color=accent_color,
+    ))
+
+
+def build_email_html(
+    title: str,
+    title_color: str,
+    accent_color: str,
+    message: str,
+    details: list,
+    button_text: str = None,
+    button_url: str = None,
+    button_color: str = "#0284c7",
+    footer: str = None
+) -> str:
+    """
+    Build styled HTML email - LIGHT THEME that works in Outlook.
+    Uses bgcolor on every cell for maximum compatibility.
+    
+    Args:
+        title: Email header title
+        title_color: Color for title text (hex)
+        accent_color: Color for accent bar and logo (hex)
+        message: Main message paragraph
+        details: List of tuples [(label, value), ...]
+        button_text: Optional CTA button text
+        button_url: Optional CTA button URL
+        button_color: Button background color
+        footer: Optional footer text
+    """
+    # Build details rows with alternating backgrounds
+    rows_html = "".join([
+        _EMAIL_ROW_TMPL.substitute(
+            row_bg="#f8fafc" if i % 2 == 0 else "#ffffff",
+            label=escape(str(label)),
+            value=escape(str(value)),
+        )
+        for i, (label, value) in enumerate(details)
+    ])
+
+    # Build button if provided
+    button_html = ""
+    if button_text and button_url:
+        button_html = _EMAIL_BUTTON_TMPL.substitute(
+            button_color=button_color,
+            button_url=escape(button_url),
+            button_text=escape(button_text),
+        )
+
+    # Build footer row
+    footer_html = ""
+    if footer:
+        footer_html = _EMAIL_FOOTER_TMPL.substitute(footer=escape(footer))
+
+    return _email_layout(title, title_color, accent_color).substitute(
+        message=escape(message),
+        rows_html=rows_html,
+        button_html=button_html,
+        footer_html=footer_html,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    )
+
+
+# Background sends retry transient SMTP/sendmail failures with backoff
+# (1s, 2s, ...) since nobody is waiting on the response any more
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "3"))
+
+
+def send_email_logged(to: str, subject: str, html_body: str):
+    """Send a notification email from a background task, logging instead of raising"""
+    for attempt in range(1, EMAIL_MAX_ATTEMPTS + 1):
+        try:
+            result = send_email(to=to, subject=subject, html_body=html_body)
+            logger.info(f"[EMAIL] '{subject}' to {to} returned: {result}")
+            if result is not False:
+                return
+        except Exception as email_error:
+            logger.error(f"Failed to send email '{subject}' to {to}: {email_error}")
+        if attempt < EMAIL_MAX_ATTEMPTS:
+            # Sync background tasks run in the threadpool, not on the loop
+            time.sleep(2 ** (attempt - 1))
+    logger.error(f"[EMAIL] Giving up on '{subject}' to {to} after {EMAIL_MAX_ATTEMPTS} attempts")
+
+
+def send_emails_logged(emails: list):
+    """Send several (to, subject, html_body) notifications from one background task"""
+    for to, subject, html_body in emails:
+        send_email_logged(to=to, subject=subject, html_body=html_body)
+
+
+def approved_email(workflow: dict, workflow_id: str, approver: str):
+    """(to, subject, html_body) telling the requestor their workflow was approved, or None"""
+    requestor_email = workflow.get("requestor_email") or workflow.get("notify_email")
+    if not EMAIL_ENABLED or not requestor_email:
+        return None
+    html_content = build_email_html(
+        title="Workflow Approved",
+        title_color="#047857",  # Emerald-700
+        accent_color="#10b981",  # Emerald-500
+        message="Your workflow has been approved and is ready for execution.",
+        details=[
+            ("Workflow ID", workflow_id),
+            ("Script", workflow.get("script_id", "N/A")),
+            ("Approved By", approver),
+            ("Status", "APPROVED"),
+        ],
+        button_text="Open Dashboard to Execute",
+        button_url=DASHBOARD_URL,
+        button_color="#059669",  # Emerald-600
+        footer="You can now execute this workflow from the dashboard."
+    )
+    return (requestor_email,
+            f"[Approved] Workflow Ready: {workflow.get('script_id', workflow_id)}",
+            html_content)
+
+
+def denied_email(workflow: dict, workflow_id: str, denier: str, reason: str):
+    """(to, subject, html_body) telling the requestor their workflow was denied, or None"""
+    requestor_email = workflow.get("requestor_email") or workflow.get("notify_email")
+    if not EMAIL_ENABLED or not requestor_email:
+        return None
+    html_content = build_email_html(
+        title="Workflow Denied",
+        title_color="#be123c",  # Rose-700
+        accent_color="#f43f5e",  # Rose-500
+        message="Your workflow request has been denied.",
+        details=[
+            ("Workflow ID", workflow_id),
+            ("Script", workflow.get("script_id", "N/A")),
+            ("Denied By", denier),
+            ("Reason", reason),
+            ("Status", "DENIED"),
+        ],
+        footer="If you believe this was in error, please contact the approver or submit a new workflow request."
+    )
+    return (requestor_email,
+            f"[Denied] Workflow Request: {workflow.get('script_id', workflow_id)}",
+            html_content)
 
 
 async def notify_agent_of_workflow(
@@ -231,12 +654,9 @@ async def notify_agent_of_workflow(
     protocol = "https" if ssl_enabled else "http"
     url = f"{protocol}://{agent_host}:{agent_port}/execute-workflow"
 
-    verify_ssl = get_ssl_verify_config()
-
     try:
-        async with httpx.AsyncClient(timeout=10.0, verify=verify_ssl) as client:
-            response = await client.post(url, json={"workflow_id": workflow_id})
-            return response.status_code == 200
+        response = await get_agent_client().post(url, json={"workflow_id": workflow_id})
+        return response.status_code == 200
     except Exception as e:
         logger.error(f"Failed to notify agent at {url}: {e}")
         return False
@@ -251,17 +671,63 @@ async def notify_agent_of_workflow(
 async def list_workflows(
     limit: Optional[int] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    summary: bool = False,
     token: dict = Depends(verify_token)
 ):
-    """List workflows with optional filters"""
+    """
+    List workflows with optional filters.
+    Pass limit to page through results: the response then carries
+    next_cursor, to be sent back as cursor for the following page.
+    summary=true returns only id, status, requestor, script and created_at.
+    """
+    if cursor and not summary and not hasattr(get_workflows_db(), "list_workflows_page"):
+        # Ignoring it would hand back page 1 forever to a paging client
+        raise HTTPException(status_code=501, detail="cursor paging is not supported by this database layer")
+
     try:
-        db = get_db()
-        workflows = db.list_workflows(limit=limit, status=status)
-        return {
-            "workflows": workflows,
-            "count": len(workflows),
-            "ssl_enabled": SSL_ENABLED
-        }
+        key = (limit, status, cursor, summary)
+        now = time.monotonic()
+        hit = _list_cache.get(key)
+        if hit and hit[0] > now:
+            result = hit[1]
+        else:
+            db = get_workflows_db()
+            # One SELECT: targets and approvals are JSON columns on the workflow
+            # row itself, so listing never issues per-row follow-up queries
+            if summary:
+                params = [status] if status else []
+                if cursor:
+                    params.extend(cursor.rpartition("|")[::2])
+                params.append(limit or -1)
+                workflows = await run_db(db.query, _SUMMARY_SQL[(bool(status), bool(cursor))], tuple(params))
+                last = workflows[-1] if limit and len(workflows) == limit else None
+                result = {
+                    "workflows": workflows,
+                    "count": len(workflows),
+                    "next_cursor": f"{last['created_at']}|{last['workflow_id']}" if last else None,
+                    "ssl_enabled": SSL_ENABLED
+                }
+            elif (limit or cursor) and hasattr(db, "list_workflows_page"):
+                page = await run_db(db.list_workflows_page, limit=limit or 50, cursor=cursor, status=status)
+                workflows = page["workflows"]
+                result = {
+                    "workflows": workflows,
+                    "count": len(workflows),
+                    "next_cursor": page["next_cursor"],
+                    "ssl_enabled": SSL_ENABLED
+                }
+            else:
+                workflows = await run_db(db.list_workflows, limit=limit, status=status)
+                result = {
+                    "workflows": workflows,
+                    "count": len(workflows),
+                    "ssl_enabled": SSL_ENABLED
+                }
+            if len(_list_cache) >= LIST_CACHE_MAX:
+                _list_cache.clear()
+            _list_cache[key] = (now + LIST_CACHE_TTL, result)
+        return result
     except Exception as e:
         logger.error(f"Error listing workflows: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -270,15 +736,23 @@ async def list_workflows(
 @router.get("/{workflow_id}")
 async def get_workflow(
     workflow_id: str,
+    request: Request,
+    response: Response,
     token: dict = Depends(verify_token)
 ):
     """Get a workflow by ID"""
-    db = get_db()
-    workflow = db.get_workflow(workflow_id)
+    db = get_workflows_db()
+    workflow = await get_workflow_cached(db, workflow_id)
 
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
+    # Hash of the body we would send, so any changed field changes the ETag
+    etag = f'W/"{hashlib.blake2b(dumps_bytes(workflow), digest_size=12).hexdigest()}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     return workflow
 
 
@@ -286,61 +760,38 @@ async def get_workflow(
 @router.post("/")
 async def create_workflow(
     request: CreateWorkflowRequest,
+    background_tasks: BackgroundTasks,
     token: dict = Depends(verify_token)
 ):
     """Create a new workflow and notify approver"""
-    db = get_db()
-    workflow_id = f"wf_{uuid.uuid4().hex[:12]}"
+    db = get_workflows_db()
+    workflow_id = f"wf_{secrets.token_hex(6)}"
 
     try:
-        # Try with requestor_email and script_params (newer DB schema)
-        try:
-            workflow = db.create_workflow(
-                workflow_id=workflow_id,
-                script_id=request.script_id,
-                targets=request.targets,
-                requestor=request.requestor,
-                required_levels=request.required_approval_levels,
-                notify_email=request.notify_email,
-                requestor_email=request.requestor_email,
-                ttl_minutes=request.ttl_minutes,
-                reason=request.reason,
-                script_params=request.script_params
-            )
-        except TypeError:
-            # Fallback for older DB schema without requestor_email/script_params
-            workflow = db.create_workflow(
-                workflow_id=workflow_id,
-                script_id=request.script_id,
-                targets=request.targets,
-                requestor=request.requestor,
-                required_levels=request.required_approval_levels,
-                notify_email=request.notify_email,
-                ttl_minutes=request.ttl_minutes,
-                reason=request.reason
-            )
-            # Store in workflow dict for later use
+        workflow = await run_db(db.create_workflow, **create_workflow_kwargs(db, request, workflow_id))
+        if not create_workflow_takes_email(db):
+            # Older DB schema: keep them in the returned workflow dict
             workflow["requestor_email"] = request.requestor_email
             workflow["script_params"] = request.script_params
 
-        db.add_audit(
+        await run_db(
+            db.add_audit,
             workflow_id=workflow_id,
             action="created",
             user=request.requestor,
             note=f"Workflow created: {request.reason}"
         )
 
+        invalidate_workflow(workflow_id)
         logger.info(f"Workflow created: {workflow_id}")
         
         # Send email notification to approver
-        logger.info(f"[EMAIL] notify_email={request.notify_email}, requestor_email={request.requestor_email}, EMAIL_ENABLED={EMAIL_ENABLED}")
+        logger.debug("[EMAIL] notify_email=%s, requestor_email=%s, EMAIL_ENABLED=%s",
+                     request.notify_email, request.requestor_email, EMAIL_ENABLED)
         
-        if request.notify_email:
+        if EMAIL_ENABLED and request.notify_email:
             logger.info(f"[EMAIL] Attempting to send approval notification to {request.notify_email}")
             try:
-                api_host = os.getenv("API_HOST", "https://localhost:7585")
-                dashboard_url = f"{api_host}/dashboard"
-                
                 # Build details list
                 details = [
                     ("Workflow ID", workflow_id),
@@ -354,7 +805,7 @@ async def create_workflow(
                 
                 # Add script parameters if present
                 if request.script_params:
-                    params_display = ', '.join([f'{k}: {v}' for k, v in request.script_params.items()])
+                    params_display = ', '.join(f'{k}: {v}' for k, v in request.script_params.items())
                     details.append(("Parameters", params_display))
                 
                 html_content = build_email_html(
@@ -364,18 +815,18 @@ async def create_workflow(
                     message="A new workflow has been submitted and requires your approval.",
                     details=details,
                     button_text="Open Dashboard to Approve",
-                    button_url=dashboard_url,
+                    button_url=DASHBOARD_URL,
                     button_color="#0284c7",  # Sky-600
                     footer=f"Requested by: {request.requestor}"
                 )
                 
-                result = send_email(
+                background_tasks.add_task(
+                    send_email_logged,
                     to=request.notify_email,
                     subject=f"[Action Required] Workflow Approval: {request.script_id} - {request.requestor}",
                     html_body=html_content
                 )
-                logger.info(f"[EMAIL] send_email returned: {result}")
-                logger.info(f"Approval notification sent to {request.notify_email} for workflow {workflow_id}")
+                logger.info(f"Approval notification queued for {request.notify_email} for workflow {workflow_id}")
                 
             except Exception as email_error:
                 logger.error(f"Failed to send approval email: {email_error}")
@@ -389,77 +840,72 @@ async def create_workflow(
 
 
 @router.post("/{workflow_id}/approve")
+@serialized_per_workflow
 async def approve_workflow(
     workflow_id: str,
     request: ApproveWorkflowRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(require_approver)
 ):
     """Approve a workflow and notify requestor"""
-    db = get_db()
+    db = get_workflows_db()
 
-    workflow = db.get_workflow(workflow_id)
+    workflow = await get_workflow_cached(db, workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
     if workflow["status"] != "pending":
         raise HTTPException(status_code=400, detail=f"Workflow is already {workflow['status']}")
 
-    success = db.add_approval(workflow_id, request.approver, request.level)
-    if not success:
-        raise HTTPException(status_code=400, detail="Already approved by this user")
-
-    workflow = db.get_workflow(workflow_id)
-    approvals = workflow.get("approvals", [])
-
-    if len(approvals) >= workflow["required_approval_levels"]:
-        db.update_workflow_status(workflow_id, "approved")
-        db.add_audit(workflow_id=workflow_id, action="fully_approved", user=request.approver, note="Workflow fully approved")
+    if hasattr(db, "add_approval_counted"):
+        # One DB call returns the new approval count (db_methods_for_workflows.py)
+        state = await run_db(db.add_approval_counted, workflow_id, request.approver, request.level)
+        invalidate_workflow(workflow_id)
+        if not state:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        if state["status"] != "pending":
+            raise HTTPException(status_code=400, detail=f"Workflow is already {state['status']}")
+        if state["conflict"]:
+            raise HTTPException(status_code=409, detail="Workflow changed during the request, retry")
+        if not state["added"]:
+            raise HTTPException(status_code=400, detail="Already approved by this user")
+        approval_count = state["approvals"]
+        required = state["required"]
+    else:
+        success = await run_db(db.add_approval, workflow_id, request.approver, request.level)
+        invalidate_workflow(workflow_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Already approved by this user")
+        refreshed = await get_workflow_cached(db, workflow_id)
+        approval_count = len(refreshed.get("approvals", []))
+        required = refreshed["required_approval_levels"]
+
+    if approval_count >= required:
+        if not await set_status_with_audit(db, workflow_id, "approved", action="fully_approved",
+                                           user=request.approver, note="Workflow fully approved",
+                                           expected_status="pending"):
+            raise HTTPException(status_code=409, detail="Workflow changed during the request, retry")
         logger.info(f"Workflow approved: {workflow_id}")
         
         # Send approval notification to requestor
-        requestor_email = workflow.get("requestor_email") or workflow.get("notify_email")
-        if requestor_email:
-            try:
-                api_host = os.getenv("API_HOST", "https://localhost:7585")
-                dashboard_url = f"{api_host}/dashboard"
-                
-                html_content = build_email_html(
-                    title="Workflow Approved",
-                    title_color="#047857",  # Emerald-700
-                    accent_color="#10b981",  # Emerald-500
-                    message="Your workflow has been approved and is ready for execution.",
-                    details=[
-                        ("Workflow ID", workflow_id),
-                        ("Script", workflow.get("script_id", "N/A")),
-                        ("Approved By", request.approver),
-                        ("Status", "APPROVED"),
-                    ],
-                    button_text="Open Dashboard to Execute",
-                    button_url=dashboard_url,
-                    button_color="#059669",  # Emerald-600
-                    footer="You can now execute this workflow from the dashboard."
-                )
-                
-                send_email(
-                    to=requestor_email,
-                    subject=f"[Approved] Workflow Ready: {workflow.get('script_id', workflow_id)}",
-                    html_body=html_content
-                )
-                logger.info(f"Approval notification sent to {requestor_email} for workflow {workflow_id}")
-                
-            except Exception as email_error:
-                logger.error(f"Failed to send approval notification: {email_error}")
+        try:
+            email = approved_email(workflow, workflow_id, request.approver)
+            if email:
+                background_tasks.add_task(send_email_logged, to=email[0], subject=email[1], html_body=email[2])
+                logger.info(f"Approval notification queued for {email[0]} for workflow {workflow_id}")
+        except Exception as email_error:
+            logger.error(f"Failed to send approval notification: {email_error}")
         
         return {"message": "Workflow fully approved", "workflow_id": workflow_id, "status": "approved"}
 
-    db.add_audit(workflow_id=workflow_id, action="partial_approval", user=request.approver,
-                 note=f"Approval {len(approvals)}/{workflow['required_approval_levels']}")
+    await run_db(db.add_audit, workflow_id=workflow_id, action="partial_approval", user=request.approver,
+                 note=f"Approval {approval_count}/{required}")
 
     return {
         "message": "Approval added",
         "workflow_id": workflow_id,
-        "approvals": len(approvals),
-        "required": workflow["required_approval_levels"]
+        "approvals": approval_count,
+        "required": required
     }
 
 
@@ -471,47 +917,64 @@ async def execute_workflow(
     user: dict = Depends(require_admin)
 ):
     """Execute an approved workflow (one-time only)"""
-    db = get_db()
-
-    workflow = db.get_workflow(workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    # Check workflow status - only "approved" can be executed
-    status = workflow.get("status")
-    if status == "executed":
-        raise HTTPException(status_code=400, detail="Workflow has already been executed")
-    if status == "denied":
-        raise HTTPException(status_code=400, detail="Workflow was denied")
-    if status == "expired":
-        raise HTTPException(status_code=400, detail="Workflow has expired")
-    if status != "approved":
-        raise HTTPException(status_code=400, detail=f"Workflow is not approved (status: {status})")
-
-    script_id = workflow.get("script_id")
-    if not script_id:
-        raise HTTPException(status_code=400, detail="Workflow has no script")
-
-    targets = workflow.get("targets") or []
-    if not targets:
-        raise HTTPException(status_code=400, detail="Workflow has no targets")
-
-    # Get parameters - use request params, fall back to stored script_params
-    stored_params = workflow.get("script_params") or {}
-    exec_params = (request.parameters if request and request.parameters else stored_params)
-    
-    # Import and call scripts execution
-    from controller.routes.scripts import ExecuteScriptRequest, execute_script
-
-    exec_request = ExecuteScriptRequest(
-        target_agents=targets,
-        parameters=exec_params,
-        environment=(request.environment if request and request.environment else {}),
-        timeout=(request.timeout if request and request.timeout else None),
-    )
+    db = get_workflows_db()
+
+    # Not cached: the one-time execution check must see the committed status.
+    # With claim_for_execution (db_methods_for_workflows.py) the check and the
+    # approved -> executing transition are one conditional UPDATE, so two
+    # concurrent requests cannot both execute; the row is only re-read to
+    # explain a failed claim. Check-and-claim also holds the workflow lock;
+    # the script run itself does not.
+    async with workflow_lock(workflow_id):
+        claimed = False
+        if hasattr(db, "claim_for_execution"):
+            workflow = await run_db(db.claim_for_execution, workflow_id)
+            invalidate_workflow(workflow_id)
+            claimed = workflow is not None
+        if not claimed:
+            workflow = await run_db(db.get_workflow, workflow_id)
+            if not workflow:
+                raise HTTPException(status_code=404, detail="Workflow not found")
+
+            # Check workflow status - only "approved" can be executed
+            status = workflow.get("status")
+            if status == "executed":
+                raise HTTPException(status_code=400, detail="Workflow has already been executed")
+            if status == "denied":
+                raise HTTPException(status_code=400, detail="Workflow was denied")
+            if status == "expired":
+                raise HTTPException(status_code=400, detail="Workflow has expired")
+            if status != "approved":
+                raise HTTPException(status_code=400, detail=f"Workflow is not approved (status: {status})")
+            if hasattr(db, "claim_for_execution"):
+                # Claim failed but the row reads approved: it changed under us
+                raise HTTPException(status_code=409, detail="Workflow status changed during the request, retry")
+
+        script_id = workflow.get("script_id")
+        targets = workflow.get("targets") or []
+        if not script_id or not targets:
+            if claimed:
+                await run_db(db.update_workflow_status, workflow_id, "approved")
+                invalidate_workflow(workflow_id)
+            if not script_id:
+                raise HTTPException(status_code=400, detail="Workflow has no script")
+            raise HTTPException(status_code=400, detail="Workflow has no targets")
+
+        # Get parameters - use request params, fall back to stored script_params
+        stored_params = workflow.get("script_params") or {}
+        exec_params = (request.parameters if request and request.parameters else stored_params)
+
+        exec_request = ExecuteScriptRequest(
+            target_agents=targets,
+            parameters=exec_params,
+            environment=(request.environment if request and request.environment else {}),
+            timeout=(request.timeout if request and request.timeout else None),
+        )
 
-    # Mark as executing before we start (prevents concurrent execution)
-    db.update_workflow_status(workflow_id, "executing")
+        # Mark as executing before we start (prevents concurrent execution)
+        if not claimed:
+            await run_db(db.update_workflow_status, workflow_id, "executing")
+            invalidate_workflow(workflow_id)
     
     try:
         result = await execute_script(
@@ -522,9 +985,11 @@ async def execute_workflow(
         )
         
         # Mark as executed after successful execution
-        db.update_workflow_status(workflow_id, "executed")
-        db.add_audit(workflow_id=workflow_id, action="executed", 
-                     user=user.get("username", "unknown"), note="Workflow executed successfully")
+        if not await set_status_with_audit(db, workflow_id, "executed", action="executed",
+                                           user=user.get("username", "unknown"), note="Workflow executed successfully",
+                                           expected_status="executing"):
+            # The script already ran; only the bookkeeping lost the race
+            logger.warning(f"Workflow {workflow_id} left 'executing' during execution; not marked executed")
         
         return {
             "message": "Workflow executed",
@@ -535,25 +1000,28 @@ async def execute_workflow(
         
     except Exception as e:
         # Mark as failed but don't allow re-execution
-        db.update_workflow_status(workflow_id, "failed")
-        db.add_audit(workflow_id=workflow_id, action="execution_failed",
-                     user=user.get("username", "unknown"), note=str(e))
+        if not await set_status_with_audit(db, workflow_id, "failed", action="execution_failed",
+                                           user=user.get("username", "unknown"), note=str(e),
+                                           expected_status="executing"):
+            logger.warning(f"Workflow {workflow_id} left 'executing' during execution; not marked failed")
         raise
 
 
 @router.delete("/{workflow_id}")
+@serialized_per_workflow
 async def delete_workflow(
     workflow_id: str,
     token: dict = Depends(verify_token)
 ):
     """Delete a workflow"""
-    db = get_db()
+    db = get_workflows_db()
 
-    workflow = db.get_workflow(workflow_id)
+    workflow = await get_workflow_cached(db, workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    db.delete_workflow(workflow_id)
+    await run_db(db.delete_workflow, workflow_id)
+    invalidate_workflow(workflow_id)
     logger.info(f"Workflow deleted: {workflow_id}")
 
     return {"message": "Workflow deleted", "workflow_id": workflow_id}
@@ -565,15 +1033,19 @@ class DenyWorkflowRequest(BaseModel):
 
 
 @router.post("/{workflow_id}/deny")
+@serialized_per_workflow
 async def deny_workflow(
     workflow_id: str,
+    background_tasks: BackgroundTasks,
     request: DenyWorkflowRequest = Body(default=None),
     user: dict = Depends(require_approver)
 ):
     """Deny a pending workflow and notify requestor"""
-    db = get_db()
+    db = get_workflows_db()
 
-    workflow = db.get_workflow(workflow_id)
+    # Not cached: the pending check decides a state change, so it must see
+    # the committed status (another worker may have just approved it)
+    workflow = await run_db(db.get_workflow, workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
@@ -583,39 +1055,20 @@ async def deny_workflow(
     denier = request.denier if request and request.denier else user.get("username", "unknown")
     reason = request.reason if request and request.reason else "Denied"
     
-    db.update_workflow_status(workflow_id, "denied")
-    db.add_audit(workflow_id=workflow_id, action="denied", user=denier, note=reason)
+    if not await set_status_with_audit(db, workflow_id, "denied", action="denied", user=denier, note=reason,
+                                       expected_status="pending"):
+        raise HTTPException(status_code=409, detail="Workflow changed during the request, retry")
     
     logger.info(f"Workflow denied: {workflow_id} by {denier}")
     
     # Send denial notification to requestor
-    requestor_email = workflow.get("requestor_email") or workflow.get("notify_email")
-    if requestor_email:
-        try:
-            html_content = build_email_html(
-                title="Workflow Denied",
-                title_color="#be123c",  # Rose-700
-                accent_color="#f43f5e",  # Rose-500
-                message="Your workflow request has been denied.",
-                details=[
-                    ("Workflow ID", workflow_id),
-                    ("Script", workflow.get("script_id", "N/A")),
-                    ("Denied By", denier),
-                    ("Reason", reason),
-                    ("Status", "DENIED"),
-                ],
-                footer="If you believe this was in error, please contact the approver or submit a new workflow request."
-            )
-            
-            send_email(
-                to=requestor_email,
-                subject=f"[Denied] Workflow Request: {workflow.get('script_id', workflow_id)}",
-                html_body=html_content
-            )
-            logger.info(f"Denial notification sent to {requestor_email} for workflow {workflow_id}")
-            
-        except Exception as email_error:
-            logger.error(f"Failed to send denial notification: {email_error}")
+    try:
+        email = denied_email(workflow, workflow_id, denier, reason)
+        if email:
+            background_tasks.add_task(send_email_logged, to=email[0], subject=email[1], html_body=email[2])
+            logger.info(f"Denial notification queued for {email[0]} for workflow {workflow_id}")
+    except Exception as email_error:
+        logger.error(f"Failed to send denial notification: {email_error}")
 
     return {
         "message": "Workflow denied",
@@ -626,25 +1079,153 @@ async def deny_workflow(
     }
 
 
+# Upper bound on decisions per bulk request (all of them hold workflow locks)
+BULK_MAX_DECISIONS = 200
+
+
+@router.post("/bulk")
+async def bulk_decide_workflows(
+    payload: BulkDecisionRequest,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(require_approver)
+):
+    """
+    Approve and/or deny several pending workflows in one request.
+    Each decision gets its own result; one failing does not stop the rest.
+    """
+    if not payload.decisions:
+        raise HTTPException(status_code=400, detail="No decisions given")
+    if len(payload.decisions) > BULK_MAX_DECISIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_DECISIONS} decisions per request")
+
+    db = get_workflows_db()
+    approver = payload.approver or user.get("username", "unknown")
+
+    if not hasattr(db, "decide_workflows_bulk"):
+        # Older DB layer: run the single-workflow handlers one by one
+        results = []
+        for d in payload.decisions:
+            try:
+                if d.action == "approve":
+                    body = await approve_workflow(
+                        workflow_id=d.workflow_id,
+                        request=ApproveWorkflowRequest(approver=approver, level=d.level),
+                        background_tasks=background_tasks, user=user)
+                else:
+                    body = await deny_workflow(
+                        workflow_id=d.workflow_id,
+                        request=DenyWorkflowRequest(denier=approver, reason=d.reason),
+                        background_tasks=background_tasks, user=user)
+                results.append({"workflow_id": d.workflow_id, "action": d.action, "ok": True,
+                                "status": body.get("status", "pending"), "detail": body["message"],
+                                "conflict": False})
+            except HTTPException as e:
+                results.append({"workflow_id": d.workflow_id, "action": d.action, "ok": False,
+                                "status": None, "detail": e.detail, "conflict": e.status_code == 409})
+        return {"approver": approver, "results": results}
+
+    # One transaction for the whole batch (db_methods_for_workflows.py),
+    # under every affected workflow's lock, taken in sorted order
+    decisions = [d.dict() for d in payload.decisions]
+    workflow_ids = sorted({d["workflow_id"] for d in decisions})
+    async with contextlib.AsyncExitStack() as stack:
+        for workflow_id in workflow_ids:
+            await stack.enter_async_context(workflow_lock(workflow_id))
+        results = await run_db(db.decide_workflows_bulk, decisions, approver)
+        for workflow_id in workflow_ids:
+            invalidate_workflow(workflow_id)
+
+    emails = []
+    for result in results:
+        workflow = result.pop("workflow")
+        if not result["ok"] or result["status"] not in ("approved", "denied"):
+            continue
+        logger.info(f"Workflow {result['status']}: {result['workflow_id']} by {approver} (bulk)")
+        try:
+            if result["status"] == "approved":
+                email = approved_email(workflow, result["workflow_id"], approver)
+            else:
+                email = denied_email(workflow, result["workflow_id"], approver, result["reason"])
+            if email:
+                emails.append(email)
+        except Exception as email_error:
+            logger.error(f"Failed to build notification for {result['workflow_id']}: {email_error}")
+
+    if emails:
+        # One task: the messages go out back to back on the shared SMTP connection
+        background_tasks.add_task(send_emails_logged, emails)
+
+    return {"approver": approver, "results": results}
+
+
 @router.get("/{workflow_id}/audit")
 async def get_workflow_audit(
     workflow_id: str,
+    request: Request,
+    response: Response,
+    count_only: bool = False,
+    since: Optional[datetime] = None,
     token: dict = Depends(verify_token)
 ):
-    """Get audit logs for a workflow"""
-    db = get_db()
+    """
+    Get audit logs for a workflow.
+    count_only=true returns just the number of entries; since=<timestamp>
+    returns only entries newer than it (incremental polling).
+    """
+    db = get_workflows_db()
 
-    workflow = db.get_workflow(workflow_id)
+    workflow = await get_workflow_cached(db, workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    logs = db.get_audit_logs(workflow_id)
+    # Audit rows are append-only: count + newest timestamp identify the log
+    version = await run_db(db.query, _AUDIT_VERSION_SQL, (workflow_id,))
+    etag = f'W/"{version[0]["n"]}-{version[0]["latest"]}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if count_only:
+        return {"workflow_id": workflow_id, "count": version[0]["n"]}
+
+    if since is not None:
+        # Audit timestamps are stored as naive UTC ISO strings
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        logs = await run_db(db.query, _AUDIT_SINCE_SQL, (workflow_id, since.isoformat()))
+        return {
+            "workflow_id": workflow_id,
+            "audit_logs": logs,
+            "count": len(logs)
+        }
 
-    return {
-        "workflow_id": workflow_id,
-        "audit_logs": logs,
-        "count": len(logs)
-    }
+    # count is the one the ETag was built from
+    return StreamingResponse(
+        stream_audit_logs(db, workflow_id, version[0]["n"]),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+async def stream_audit_logs(db, workflow_id: str, count: int):
+    """Yield the audit log response body one batch of rows at a time"""
+    yield b'{"workflow_id":' + dumps_bytes(workflow_id) + b',"count":' + str(count).encode() + b',"audit_logs":['
+    sep = b""
+    rows = await run_db(db.query, _AUDIT_FIRST_BATCH_SQL, (workflow_id, AUDIT_STREAM_BATCH))
+    while rows:
+        chunk = []
+        for row in rows:
+            rowid = row.pop("_rowid")
+            chunk.append(sep + dumps_bytes(row))
+            sep = b","
+        yield b"".join(chunk)
+        if len(rows) < AUDIT_STREAM_BATCH:
+            break
+        rows = await run_db(
+            db.query, _AUDIT_NEXT_BATCH_SQL,
+            (workflow_id, rows[-1]["timestamp"], rowid, AUDIT_STREAM_BATCH)
+        )
+    yield b"]}"
 
 
 # =============================================================================
@@ -652,28 +1233,31 @@ async def get_workflow_audit(
 # =============================================================================
 
 @router.post("/{workflow_id}/reexec/request")
+@serialized_per_workflow
 async def request_reexecution(
     workflow_id: str,
     payload: ReexecRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(verify_token)
 ):
     """Request approval for re-execution of a workflow"""
-    db = get_db()
-    wf = db.get_workflow(workflow_id)
+    db = get_workflows_db()
+    wf = await get_workflow_cached(db, workflow_id)
     if not wf:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
     requester = user.get('username') or user.get('token_name') or 'unknown'
     requester_email = payload.requester_email or wf.get('notify_email')
-    req = db.create_execution_approval_request(workflow_id, requester, requester_email, payload.note or "")
+    req = await run_db(db.create_execution_approval_request, workflow_id, requester, requester_email, payload.note or "")
 
     approver_target = wf.get('notify_email') or requester_email
+    if not EMAIL_ENABLED:
+        return {"message": "Approval request created", "request": req}
     if not approver_target:
         logger.warning("No approver email configured for workflow %s", workflow_id)
         return {"message": "Approval request created", "request": req}
 
-    api_host = os.getenv("API_HOST", "http://localhost:8000")
-    approve_url = f"{api_host}/api/workflows/{workflow_id}/reexec/approve?request_id={req['id']}"
+    approve_url = f"{REEXEC_API_BASE}/{workflow_id}/reexec/approve?request_id={req['id']}"
 
     html_content = build_email_html(
         title="Re-execution Approval Required",
@@ -689,33 +1273,51 @@ async def request_reexecution(
         footer="POST to the Approve URL to approve this request."
     )
 
-    send_email(approver_target, f"[Action Required] Re-execution approval for {workflow_id}", html_content)
+    background_tasks.add_task(send_email_logged, approver_target, f"[Action Required] Re-execution approval for {workflow_id}", html_content)
     return {"message": "Approval request created and approver notified", "request": req}
 
 
 @router.post("/{workflow_id}/reexec/approve")
+@serialized_per_workflow
 async def approve_reexecution(
     workflow_id: str,
     payload: ApprovePayload,
+    background_tasks: BackgroundTasks,
     approver_jwt: dict = Depends(verify_approver_jwt)
 ):
     """Approve a re-execution request (requires approver JWT)"""
-    db = get_db()
-    req = db.get_execution_approval_request(payload.request_id)
-    if not req:
-        raise HTTPException(status_code=404, detail="Approval request not found")
-    if req['workflow_id'] != workflow_id:
-        raise HTTPException(status_code=400, detail="Mismatched workflow")
-    if req['status'] != 'pending':
-        raise HTTPException(status_code=400, detail="Request not pending")
-
+    db = get_workflows_db()
     approver = approver_jwt.get('sub') or approver_jwt.get('username') or 'approver'
-    token_row = db.approve_execution_request(payload.request_id, approver)
-    if not token_row:
-        raise HTTPException(status_code=500, detail="Failed to approve request")
 
-    requester_email = req.get('requester_email') or (db.get_workflow(workflow_id) or {}).get('notify_email')
-    if requester_email:
+    if hasattr(db, "approve_reexec_atomic"):
+        # Claim + token + emails in one DB call (db_methods_for_workflows.py);
+        # the request is only re-read to explain a failed claim
+        token_row = await run_db(db.approve_reexec_atomic, payload.request_id, workflow_id, approver)
+        if not token_row:
+            req = await run_db(db.get_execution_approval_request, payload.request_id)
+            if not req:
+                raise HTTPException(status_code=404, detail="Approval request not found")
+            if req['workflow_id'] != workflow_id:
+                raise HTTPException(status_code=400, detail="Mismatched workflow")
+            raise HTTPException(status_code=400, detail="Request not pending")
+        requester_email = token_row.get('requester_email') or token_row.get('notify_email')
+    else:
+        req = await run_db(db.get_execution_approval_request, payload.request_id)
+        if not req:
+            raise HTTPException(status_code=404, detail="Approval request not found")
+        if req['workflow_id'] != workflow_id:
+            raise HTTPException(status_code=400, detail="Mismatched workflow")
+        if req['status'] != 'pending':
+            raise HTTPException(status_code=400, detail="Request not pending")
+
+        token_row = await run_db(db.approve_execution_request, payload.request_id, approver)
+        if not token_row:
+            raise HTTPException(status_code=500, detail="Failed to approve request")
+
+        requester_email = req.get('requester_email')
+        if EMAIL_ENABLED and not requester_email:
+            requester_email = ((await get_workflow_cached(db, workflow_id)) or {}).get('notify_email')
+    if EMAIL_ENABLED and requester_email:
         html_content = build_email_html(
             title="Re-execution Approved",
             title_color="#047857",  # Emerald-700
@@ -728,6 +1330,18 @@ async def approve_reexecution(
             ],
             footer="Use this token to execute the workflow."
         )
-        send_email(requester_email, f"[Approved] Execution token for {workflow_id}", html_content)
+        background_tasks.add_task(send_email_logged, requester_email, f"[Approved] Execution token for {workflow_id}", html_content)
 
     return {"message": "Approved and token issued", "token_id": token_row.get('id')}
+
+
+# =============================================================================
+# Admin
+# =============================================================================
+
+@router.post("/ssl/reload")
+async def reload_ssl(user: dict = Depends(require_admin)):
+    """Re-read SSL_CA_CERTS for agent notifications (e.g. after rotating the CA bundle)"""
+    verify = await reload_ssl_config()
+    logger.info(f"SSL verify config reloaded: {verify}")
+    return {"ssl_verify": bool(verify), "ca_certs": verify or None}